@@ -0,0 +1,33 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup(database=None, keep=False, **overrides):
+    """
+    Configure Django against a throwaway SQLite database so benchmarks never
+    touch db.sqlite3. Returns the database path; the database is removed
+    when the process exits unless `keep` is true.
+    """
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "softdesk.settings")
+    from django.conf import settings
+
+    if database is None:
+        directory = tempfile.mkdtemp()
+        if not keep:
+            atexit.register(shutil.rmtree, directory, ignore_errors=True)
+        database = os.path.join(directory, "benchmark.sqlite3")
+    settings.DATABASES["default"]["NAME"] = database
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+    import django
+
+    django.setup()
+    return database
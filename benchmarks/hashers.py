@@ -0,0 +1,83 @@
+"""
+Logins per second and per core for each configured password hasher, and
+through the token endpoint with the first one.
+
+    python -m benchmarks.hashers --runs 20 --cost pbkdf2_iterations=600000
+"""
+
+import argparse
+import functools
+import json
+import statistics
+import time
+
+from benchmarks import _django
+
+
+def measure(function, runs):
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def report(name, duration):
+    print(
+        f"{name}: {duration * 1000:.1f} ms, "
+        f"{1 / duration:.1f} logins/s per core"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--cost",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="override a PASSWORD_HASHING entry",
+    )
+    args = parser.parse_args()
+
+    _django.setup(ALLOWED_HOSTS=["testserver"])
+    from django.conf import settings
+    from django.contrib.auth.hashers import get_hashers
+    from django.core.management import call_command
+    from django.test import Client
+    from django.urls import reverse
+    from users.hashers import DEFAULT_COSTS, get_cost
+    from users.models import User
+
+    for cost in args.cost:
+        name, value = cost.split("=")
+        settings.PASSWORD_HASHING[name] = int(value)
+    costs = {name: get_cost(name) for name in DEFAULT_COSTS}
+    print(f"Median of {args.runs} runs, costs: {json.dumps(costs)}")
+    for hasher in get_hashers():
+        try:
+            encoded = hasher.encode("password123", hasher.salt())
+        except ValueError as error:
+            # missing optional library, e.g. argon2-cffi
+            print(f"{hasher.algorithm}: skipped ({error})")
+            continue
+        verify = functools.partial(hasher.verify, "password123", encoded)
+        report(hasher.algorithm, measure(verify, args.runs))
+
+    call_command("migrate", verbosity=0)
+    User.objects.create_user(
+        username="benchmark", password="password123", birth_date="2000-01-01"
+    )
+    client, url = Client(), reverse("token_obtain_pair")
+    credentials = {"username": "benchmark", "password": "password123"}
+    assert client.post(url, credentials).status_code == 200
+    report(
+        f"{url} ({get_hashers()[0].algorithm})",
+        measure(lambda: client.post(url, credentials), args.runs),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Query plans and timings of the hot Issue/Comment/Contributor queries, on a
+seeded SQLite database, before and after the composite indexes.
+
+    python -m benchmarks.query_plans --issues 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import _django
+
+
+def seed(users, projects, issues, comments, contributors_per_project):
+    from django.db import connection, transaction
+
+    rng = random.Random(10)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def timestamp(i):
+        return (start + timedelta(seconds=i)).isoformat(" ")
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO users_user (id, password, is_superuser, username,"
+            " first_name, last_name, email, is_staff, is_active, date_joined,"
+            " birth_date, can_be_contacted, can_data_be_shared, created_at)"
+            " VALUES (%s, '', 0, %s, '', '', '', 0, 1, %s, '2000-01-01', 0, 0, %s)",
+            [(i, f"user{i}", timestamp(i), timestamp(i)) for i in range(1, users + 1)],
+        )
+        cursor.executemany(
+            "INSERT INTO projects_project (id, title, description, category,"
+            " author_id, created_at, updated_at)"
+            " VALUES (%s, %s, '', 'back-end', %s, %s, %s)",
+            [
+                (i, f"Project {i}", rng.randint(1, users), timestamp(i), timestamp(i))
+                for i in range(1, projects + 1)
+            ],
+        )
+        members = {}
+        rows = []
+        for project_id in range(1, projects + 1):
+            members[project_id] = rng.sample(
+                range(1, users + 1), contributors_per_project
+            )
+            rows += [
+                (user_id, project_id, timestamp(project_id))
+                for user_id in members[project_id]
+            ]
+        cursor.executemany(
+            "INSERT INTO projects_contributor (user_id, project_id, created_at)"
+            " VALUES (%s, %s, %s)",
+            rows,
+        )
+        statuses = ["to-do", "in-progress", "finished"]
+        for offset in range(0, issues, 50_000):
+            rows = []
+            for i in range(offset + 1, min(offset + 50_000, issues) + 1):
+                project_id = rng.randint(1, projects)
+                rows.append(
+                    (
+                        i,
+                        f"Issue {i}",
+                        "Lorem ipsum dolor sit amet " * 4,
+                        rng.choice(statuses),
+                        rng.choice(members[project_id]),
+                        rng.choice(members[project_id]),
+                        project_id,
+                        timestamp(i),
+                        timestamp(i),
+                    )
+                )
+            cursor.executemany(
+                "INSERT INTO projects_issue (id, title, description, priority,"
+                " tag, status, author_id, assigned_to_id, project_id,"
+                " created_at, updated_at)"
+                " VALUES (%s, %s, %s, 'medium', 'bug', %s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+        for offset in range(0, comments, 50_000):
+            cursor.executemany(
+                "INSERT INTO projects_comment (id, description, author_id,"
+                " issue_id, created_at, updated_at)"
+                " VALUES (%s, 'Lorem ipsum', %s, %s, %s, %s)",
+                [
+                    (
+                        "%032x" % rng.getrandbits(128),
+                        rng.randint(1, users),
+                        rng.randint(1, issues),
+                        timestamp(i),
+                        timestamp(i),
+                    )
+                    for i in range(offset, min(offset + 50_000, comments))
+                ],
+            )
+        cursor.execute("ANALYZE")
+
+
+def hot_queries(sample_project, sample_issue, sample_user):
+    from projects.models import Comment, Contributor, Issue
+
+    # only select columns that exist in both schemas
+    return {
+        "issues of a project by creation": Issue.objects.filter(
+            project_id=sample_project
+        )
+        .order_by("created_at", "id")
+        .values("id", "title")[:5],
+        "comments of an issue by creation": Comment.objects.filter(
+            issue_id=sample_issue
+        )
+        .order_by("created_at", "id")
+        .values("id", "description")[:5],
+        "open issues assigned to a user": Issue.objects.filter(
+            assigned_to_id=sample_user, status="to-do"
+        ).values("id", "title"),
+        "membership lookup": Contributor.objects.filter(
+            user_id=sample_user, project_id=sample_project
+        ).values("id"),
+    }
+
+
+def report(title, queries, runs):
+    print(f"\n=== {title} ===")
+    for name, queryset in queries.items():
+        durations = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            list(queryset.all())
+            durations.append(time.perf_counter() - start)
+        print(f"\n{name}: {statistics.median(durations) * 1000:.3f} ms")
+        print("  " + queryset.explain().replace("\n", "\n  "))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--projects", type=int, default=2_000)
+    parser.add_argument("--issues", type=int, default=1_000_000)
+    parser.add_argument("--comments", type=int, default=500_000)
+    parser.add_argument("--contributors-per-project", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="keep the seeded database once done",
+    )
+    args = parser.parse_args()
+
+    database = _django.setup(keep=args.keep)
+    from django.core.management import call_command
+    from django.db import connection
+    from projects.models import Issue
+
+    print(f"Seeding {args.issues} issues in {database}")
+    call_command("migrate", "projects", "0003", verbosity=0)
+    seed(
+        args.users,
+        args.projects,
+        args.issues,
+        args.comments,
+        args.contributors_per_project,
+    )
+    sample = Issue.objects.values("id", "project_id", "assigned_to_id")[
+        args.issues // 2
+    ]
+    queries = hot_queries(
+        sample["project_id"], sample["id"], sample["assigned_to_id"]
+    )
+    report("before (FK indexes only)", queries, args.runs)
+
+    call_command("migrate", verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    report("after (composite indexes)", queries, args.runs)
+
+
+if __name__ == "__main__":
+    main()
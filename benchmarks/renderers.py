@@ -0,0 +1,105 @@
+"""
+Render throughput of DRF's JSONRenderer against FastJSONRenderer on pages
+shaped like the issues and comments list responses.
+
+    python -m benchmarks.renderers --rows 100 --runs 500
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import _django
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do".split()
+
+
+def text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def issues_page(rng, rows):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return {
+        "next": "http://testserver/projects/1/issues/?cursor=WyIyMDI0Il0%3D",
+        "results": [
+            {
+                "id": i,
+                "title": text(rng, 6),
+                "description": text(rng, 300),
+                "priority": "medium",
+                "tag": "bug",
+                "status": "to-do",
+                "comment_count": rng.randint(0, 50),
+                "created_at": (start + timedelta(seconds=i)).isoformat(),
+                "updated_at": (start + timedelta(seconds=i)).isoformat(),
+                "project": 1,
+                "author": rng.randint(1, 100),
+                "assigned_to": rng.randint(1, 100),
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def comments_page(rng, rows):
+    # raw UUIDs and datetimes, as handed over by views that skip serializers
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return {
+        "next": None,
+        "results": [
+            {
+                "id": uuid.UUID(int=rng.getrandbits(128)),
+                "description": text(rng, 60),
+                "created_at": start + timedelta(seconds=i),
+                "updated_at": start + timedelta(seconds=i),
+                "issue": 1,
+                "author": rng.randint(1, 100),
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def measure(renderer, data, runs):
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        renderer.render(data)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    _django.setup()
+    from rest_framework.renderers import JSONRenderer
+    from softdesk import renderers
+
+    if renderers.orjson is None:
+        print("orjson is not installed: FastJSONRenderer uses the stdlib")
+    rng = random.Random(10)
+    pages = {
+        "issues page": issues_page(rng, args.rows),
+        "comments page": comments_page(rng, args.rows),
+    }
+    for name, data in pages.items():
+        size = len(JSONRenderer().render(data))
+        before = measure(JSONRenderer(), data, args.runs)
+        after = measure(renderers.FastJSONRenderer(), data, args.runs)
+        print(
+            f"{name} ({size / 1024:.0f} KiB): "
+            f"{size / before / 2**20:.0f} MiB/s -> "
+            f"{size / after / 2**20:.0f} MiB/s ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
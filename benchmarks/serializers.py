@@ -0,0 +1,97 @@
+"""
+Serialization time of list pages: regular serializers over model instances
+against the `.values()` representation path.
+
+    python -m benchmarks.serializers --rows 100 --runs 200
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks import _django
+
+
+def seed(rows):
+    from projects.models import Project, Issue, Comment
+    from users.models import User
+
+    user = User.objects.create(username="benchmark", birth_date="2000-01-01")
+    project = Project.objects.create(title="Benchmark", author=user)
+    Issue.objects.bulk_create(
+        Issue(
+            project=project,
+            author=user,
+            assigned_to=user,
+            title=f"Issue {i}",
+            description="Lorem ipsum dolor sit amet " * 4,
+        )
+        for i in range(rows)
+    )
+    issue = Issue.objects.first()
+    Comment.objects.bulk_create(
+        Comment(
+            issue=issue,
+            project=project,
+            author=user,
+            description="Lorem ipsum",
+        )
+        for _ in range(rows)
+    )
+
+
+def regular(serializer_class, queryset):
+    return serializer_class(queryset, many=True).data
+
+
+def values(serializer_class, queryset):
+    from softdesk.serializers import represent_row
+
+    plan = serializer_class.get_values_plan()
+    columns = {column for _, column, _ in plan}
+    return [represent_row(plan, row) for row in queryset.values(*columns)]
+
+
+def measure(function, serializer_class, queryset, runs):
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(serializer_class, queryset.all())
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    _django.setup()
+    from django.core.management import call_command
+    from projects.models import Project, Issue, Comment
+    from projects.serializer import (
+        ProjectListSerializer,
+        IssueSerializer,
+        CommentSerializer,
+    )
+
+    call_command("migrate", verbosity=0)
+    seed(args.rows)
+    cases = [
+        (ProjectListSerializer, Project.objects.all()),
+        (IssueSerializer, Issue.objects.order_by("created_at", "id")),
+        (CommentSerializer, Comment.objects.order_by("created_at", "id")),
+    ]
+    print(f"Median of {args.runs} runs, {args.rows} rows per page")
+    for serializer_class, queryset in cases:
+        before = measure(regular, serializer_class, queryset, args.runs)
+        after = measure(values, serializer_class, queryset, args.runs)
+        print(
+            f"{serializer_class.__name__}: {before:.3f} ms -> {after:.3f} ms"
+            f" ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Concurrent API reads and writes on a SQLite file: Django's defaults against
+the profile of softdesk/settings.py (WAL, mmap, persistent connections).
+
+    python -m benchmarks.sqlite_load --readers 8 --writers 2 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import threading
+import time
+
+from benchmarks import _django
+
+PROFILES = {
+    "defaults": {"SQLITE_PRAGMAS": {}, "CONN_MAX_AGE": 0},
+    "tuned": {},
+}
+
+
+def seed(rows):
+    from projects.models import Project, Contributor, Issue
+    from users.models import User
+    from users.serializer import TokenObtainPairSerializer
+
+    user = User.objects.create(username="benchmark", birth_date="2000-01-01")
+    project = Project.objects.create(title="Benchmark", author=user)
+    # issues may only be assigned to contributors
+    Contributor.objects.create(user=user, project=project)
+    Issue.objects.bulk_create(
+        Issue(project=project, author=user, assigned_to=user, title=f"Issue {i}")
+        for i in range(rows)
+    )
+    token = TokenObtainPairSerializer.get_token(user).access_token
+    return f"Bearer {token}"
+
+
+def work(request, deadline, counts, lock, name):
+    from django.db import OperationalError
+
+    durations, failed = [], 0
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            ok = request().status_code < 300
+        except OperationalError:
+            # "database is locked": a deferred transaction could not upgrade
+            # to a write lock
+            ok = False
+        if ok:
+            durations.append(time.perf_counter() - start)
+        else:
+            failed += 1
+    with lock:
+        counts[name] += durations
+        counts[f"{name} failed"] += failed
+
+
+def run(profile, args, results):
+    overrides = dict(PROFILES[profile])
+    conn_max_age = overrides.pop("CONN_MAX_AGE", None)
+    _django.setup(ALLOWED_HOSTS=["testserver"], **overrides)
+    from django.core.management import call_command
+    from django.db import connection, connections
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    if conn_max_age is not None:
+        connections.settings["default"]["CONN_MAX_AGE"] = conn_max_age
+    call_command("migrate", verbosity=0)
+    bearer = seed(args.rows)
+    connection.close()
+
+    issues_url = reverse("project-issues", kwargs={"pk": 1})
+    # durations of the successful requests, number of failed ones
+    counts = {"reads": [], "reads failed": 0, "writes": [], "writes failed": 0}
+    lock = threading.Lock()
+
+    def reader():
+        client = APIClient(headers={"Authorization": bearer})
+        return lambda: client.get(issues_url, {"page_size": 20})
+
+    def writer():
+        client = APIClient(headers={"Authorization": bearer})
+        data = {"project": 1, "title": "Issue", "assigned_to": 1}
+        return lambda: client.post(reverse("issue-list"), data, format="json")
+
+    deadline = time.monotonic() + args.seconds
+    threads = [
+        threading.Thread(
+            target=work, args=(reader(), deadline, counts, lock, "reads")
+        )
+        for _ in range(args.readers)
+    ] + [
+        threading.Thread(
+            target=work, args=(writer(), deadline, counts, lock, "writes")
+        )
+        for _ in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    rates = {
+        name: (
+            len(counts[name]) / args.seconds,
+            statistics.quantiles(counts[name], n=100)[98] * 1000,
+        )
+        for name in ["reads", "writes"]
+    }
+    rates["failed"] = (
+        counts["reads failed"] + counts["writes failed"]
+    ) / args.seconds
+    results[profile] = rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    # one process per profile: settings are read once per process
+    context = multiprocessing.get_context("spawn")
+    results = context.Manager().dict()
+    for profile in PROFILES:
+        process = context.Process(target=run, args=(profile, args, results))
+        process.start()
+        process.join()
+
+    print(
+        f"{args.readers} readers, {args.writers} writers, {args.seconds:g} s"
+    )
+    for profile, rates in results.items():
+        print(
+            f"{profile}: "
+            + ", ".join(
+                f"{rates[name][0]:.0f} {name}/s (p99 {rates[name][1]:.0f} ms)"
+                for name in ["reads", "writes"]
+            )
+            + f", {rates["failed"]:.1f} failures/s"
+        )
+    before, after = results["defaults"], results["tuned"]
+    print(
+        ", ".join(
+            f"{name} {after[name][0] / before[name][0]:.1f}x"
+            for name in ["reads", "writes"]
+        )
+    )
+
+if __name__ == "__main__":
+    main()
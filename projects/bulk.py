@@ -0,0 +1,209 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from projects.models import Contributor, Issue, Comment, Project
+from projects.counters import bump, issue_status_deltas
+from projects.caching import invalidate
+from projects.serializer import (
+    IssueBatchItemSerializer,
+    CommentBatchItemSerializer,
+)
+
+NOT_FOUND = "Issue introuvable dans ce projet"
+FORBIDDEN = "Vous n'avez pas la permission de faire ceci"
+DUPLICATE = "Issue présente plusieurs fois dans le lot"
+COMMENT_EXISTS = "Un commentaire avec cet identifiant existe déjà"
+
+
+def add_deltas(deltas, more):
+    for name, delta in more.items():
+        deltas[name] = deltas.get(name, 0) + delta
+    return deltas
+
+
+def parse_id(value):
+    # (pk, None), or (None, errors) when `value` is not an integer
+    try:
+        return serializers.IntegerField().run_validation(value), None
+    except serializers.ValidationError as error:
+        return None, error.detail
+
+
+class IssueBatch:
+    """
+    Create, update and delete issues of one project in a single request.
+    Membership, assignees and targeted issues are loaded once for the whole
+    batch; nothing is written unless every item is valid.
+    """
+
+    def __init__(self, request, project, create=(), update=(), delete=()):
+        self.request = request
+        self.project = project
+        self.create_items = list(create)
+        self.update_items = list(update)
+        self.delete_ids = list(delete)
+        self.context = {
+            "request": request,
+            "contributor_ids": set(
+                Contributor.objects.filter(project=project).values_list(
+                    "user_id", flat=True
+                )
+            ),
+        }
+        # update items are plain dicts: their id is checked here
+        self.update_ids = [
+            parse_id(item.get("id", serializers.empty))
+            for item in self.update_items
+        ]
+        target_ids = [pk for pk, _ in self.update_ids if pk is not None]
+        target_ids += self.delete_ids
+        self.issues = Issue.objects.filter(project=project).in_bulk(target_ids)
+        self.seen = set()
+        self.errors = {}
+
+    def validate(self):
+        self.created = self.validate_create()
+        self.updated = self.validate_update()
+        self.deleted = self.validate_delete()
+        return not self.errors
+
+    def validate_create(self):
+        instances, errors = [], []
+        for item in self.create_items:
+            serializer = IssueBatchItemSerializer(
+                data=item, context=self.context
+            )
+            if serializer.is_valid():
+                instances.append(
+                    Issue(
+                        project=self.project,
+                        author=self.request.user,
+                        **serializer.validated_data,
+                    )
+                )
+            errors.append(serializer.errors)
+        if any(errors):
+            self.errors["create"] = errors
+        return instances
+
+    def get_target(self, pk):
+        # (issue, None) when the current user may change it, else (None, error)
+        issue = self.issues.get(pk)
+        if issue is None:
+            return None, NOT_FOUND
+        # an issue is updated or deleted at most once per batch
+        if pk in self.seen:
+            return None, DUPLICATE
+        self.seen.add(pk)
+        user = self.request.user
+        if issue.author_id != user.pk and not user.is_superuser:
+            return None, FORBIDDEN
+        return issue, None
+
+    def validate_update(self):
+        changes, errors = [], []
+        for item, (pk, id_errors) in zip(self.update_items, self.update_ids):
+            if id_errors:
+                errors.append({"id": id_errors})
+                continue
+            issue, error = self.get_target(pk)
+            if error:
+                errors.append({"id": [error]})
+                continue
+            serializer = IssueBatchItemSerializer(
+                issue, data=item, partial=True, context=self.context
+            )
+            if serializer.is_valid():
+                changes.append((issue, serializer.validated_data))
+            errors.append(serializer.errors)
+        if any(errors):
+            self.errors["update"] = errors
+        return changes
+
+    def validate_delete(self):
+        issues, errors = [], []
+        for pk in self.delete_ids:
+            issue, error = self.get_target(pk)
+            errors.append({"id": [error]} if error else {})
+            if issue is not None:
+                issues.append(issue)
+        if any(errors):
+            self.errors["delete"] = errors
+        return issues
+
+    @transaction.atomic
+    def save(self):
+        # bulk queries send no signals: counters and cached responses are
+        # kept up to date here, with one update of the project
+        deltas = {}
+        Issue.objects.bulk_create(self.created)
+        for issue in self.created:
+            add_deltas(deltas, issue_status_deltas(issue.status, 1))
+
+        fields, now = {"updated_at"}, timezone.now()
+        for issue, validated_data in self.updated:
+            add_deltas(deltas, issue_status_deltas(issue.status, -1))
+            for attr, value in validated_data.items():
+                setattr(issue, attr, value)
+                fields.add(attr)
+            issue.updated_at = now
+            add_deltas(deltas, issue_status_deltas(issue.status, 1))
+        if self.updated:
+            updated = [issue for issue, _ in self.updated]
+            Issue.objects.bulk_update(updated, sorted(fields))
+            invalidate(Issue, *(issue.pk for issue in updated))
+
+        # regular deletion, so comments cascade and counters follow
+        if self.deleted:
+            Issue.objects.filter(
+                pk__in=[issue.pk for issue in self.deleted]
+            ).delete()
+
+        bump(Project, self.project.pk, **deltas)
+        return {
+            "create": self.represent(self.created),
+            "update": self.represent(issue for issue, _ in self.updated),
+            "delete": [issue.pk for issue in self.deleted],
+        }
+
+    def represent(self, issues):
+        return [
+            IssueBatchItemSerializer(issue, context=self.context).data
+            for issue in issues
+        ]
+
+
+def create_comments(request, issue, items):
+    """
+    Validate then insert comments on `issue` in one query. Returns
+    (comments, None), or (None, errors) with one entry per item when any
+    item is invalid.
+    """
+    serializer = CommentBatchItemSerializer(data=items, many=True)
+    if not serializer.is_valid():
+        return None, serializer.errors
+    comments = [
+        Comment(
+            issue=issue,
+            project_id=issue.project_id,
+            author=request.user,
+            **validated_data,
+        )
+        for validated_data in serializer.validated_data
+    ]
+    ids = [comment.pk for comment in comments]
+    taken = set(Comment.objects.filter(pk__in=ids).values_list("pk", flat=True))
+    errors, seen = [], set()
+    for pk in ids:
+        duplicate = pk in taken or pk in seen
+        errors.append({"id": [COMMENT_EXISTS]} if duplicate else {})
+        seen.add(pk)
+    if any(errors):
+        return None, errors
+
+    with transaction.atomic():
+        Comment.objects.bulk_create(comments)
+        # one bump per parent instead of one per comment
+        bump(Issue, issue.pk, comment_count=len(comments))
+        bump(Project, issue.project_id, comment_count=len(comments))
+    return comments, None
@@ -0,0 +1,122 @@
+import uuid
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from rest_framework.response import Response
+from projects.membership import can_view
+from projects.conditional import conditional_response
+from softdesk.serializers import is_sparse
+
+RESPONSE_CACHE = "responses"
+GENERATION_KEY = "softdesk:generation"
+
+
+def get_cache():
+    return caches[RESPONSE_CACHE]
+
+
+def canonical_pk(model, pk):
+    return str(model._meta.pk.to_python(pk))
+
+
+def version_key(model, pk):
+    return f"softdesk:version:{model._meta.label_lower}:{canonical_pk(model, pk)}"
+
+
+def entry_key(model, pk):
+    # Entries are keyed by random version tokens rather than counters: a
+    # version key evicted from the cache can never resurrect old entries,
+    # and a response computed before an invalidation is stored under a
+    # token nobody reads anymore, see replace_tokens
+    keys = [GENERATION_KEY, version_key(model, pk)]
+    cache = get_cache()
+    versions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return "softdesk:response:{}:{}:{}:{}".format(
+        model._meta.label_lower,
+        canonical_pk(model, pk),
+        versions[GENERATION_KEY],
+        versions[keys[1]],
+    )
+
+
+def replace_tokens(keys):
+    def replace():
+        get_cache().set_many(
+            {key: uuid.uuid4().hex for key in keys}, timeout=None
+        )
+
+    replace()
+    # until the write commits, other connections still read the old rows
+    # and may cache them under the token just set: replace it again once
+    # they can see the write
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(replace)
+
+
+def invalidate(model, *pks):
+    replace_tokens([version_key(model, pk) for pk in pks])
+
+
+def invalidate_all():
+    replace_tokens([GENERATION_KEY])
+
+
+class CachedRetrieveMixin:
+    """
+    Serve `retrieve` from the response cache. Entries keep the ids needed
+    to authorize the current user, so a hit costs no query beyond the
+    membership lookup, and `updated_at` to answer conditional requests.
+    """
+
+    def get_access_ids(self, instance):
+        # (author_id, project_id) checked on retrieval, see can_view
+        raise NotImplementedError
+
+    def retrieve(self, request, *args, **kwargs):
+        if is_sparse(request):
+            # entries hold the full representation only
+            instance = self.get_object()
+            return conditional_response(
+                request,
+                instance.updated_at,
+                lambda: Response(self.get_serializer(instance).data),
+            )
+
+        model = self.get_queryset().model
+        lookup = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            key = entry_key(model, lookup)
+        except ValidationError:
+            return super().retrieve(request, *args, **kwargs)
+
+        cache = get_cache()
+        entry = cache.get(key)
+        if entry is None:
+            instance = self.get_object()
+
+            def render():
+                author_id, project_id = self.get_access_ids(instance)
+                entry = {
+                    "data": dict(self.get_serializer(instance).data),
+                    "author_id": author_id,
+                    "project_id": project_id,
+                    "updated_at": instance.updated_at,
+                }
+                cache.set(key, entry)
+                return Response(entry["data"])
+
+            return conditional_response(
+                request, instance.updated_at, render, key
+            )
+
+        if not request.auth or not can_view(
+            request, entry["author_id"], entry["project_id"]
+        ):
+            self.permission_denied(request)
+        return conditional_response(
+            request, entry["updated_at"], lambda: Response(entry["data"]), key
+        )
@@ -0,0 +1,123 @@
+import base64
+import datetime
+import json
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from projects.models import Issue, Comment, Tombstone
+
+# Tombstones older than this are pruned (see prune_tombstones): a client
+# whose last sync is older cannot learn about deletions anymore
+TOMBSTONE_RETENTION = datetime.timedelta(days=30)
+INVALID_CURSOR = "Curseur invalide"
+TOMBSTONE_MODELS = {Tombstone.ISSUE: Issue, Tombstone.COMMENT: Comment}
+
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(encoded):
+    # {"issues": [updated_at, pk], "comments": [updated_at, pk],
+    #  "deleted": tombstone id, "synced_at": time the cursor was issued}
+    if not encoded:
+        return {}
+    try:
+        position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        if not isinstance(position, dict):
+            raise ValueError
+        for name, model in [("issues", Issue), ("comments", Comment)]:
+            if name in position:
+                updated_at, pk = position[name]
+                position[name] = [
+                    model._meta.get_field("updated_at").to_python(updated_at),
+                    model._meta.pk.to_python(pk),
+                ]
+        if "deleted" in position:
+            position["deleted"] = int(position["deleted"])
+        position["synced_at"] = datetime.datetime.fromisoformat(
+            position["synced_at"]
+        )
+        if timezone.is_naive(position["synced_at"]):
+            raise ValueError
+        return position
+    except (KeyError, TypeError, ValueError, DjangoValidationError):
+        raise NotFound(INVALID_CURSOR)
+
+
+def is_expired(position):
+    synced_at = position.get("synced_at")
+    return synced_at is not None and (
+        synced_at < timezone.now() - TOMBSTONE_RETENTION
+    )
+
+
+def prune_tombstones(now=None):
+    deleted_before = (now or timezone.now()) - TOMBSTONE_RETENTION
+    deleted, _ = Tombstone.objects.filter(
+        deleted_at__lt=deleted_before
+    ).delete()
+    return deleted
+
+
+def updated_since(queryset, position, limit):
+    # rows ordered by (updated_at, pk) strictly after `position`
+    if position is not None:
+        updated_at, pk = position
+        queryset = queryset.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=pk)
+        )
+    rows = list(queryset.order_by("updated_at", "pk")[: limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def get_changes(project, position, limit):
+    """
+    Issues and comments of `project` created or updated, and tombstones
+    recorded, after `position`. Each stream returns at most `limit` rows;
+    `more` tells whether another call is needed to catch up.
+    """
+    issues, more_issues = updated_since(
+        Issue.objects.filter(project=project), position.get("issues"), limit
+    )
+    comments, more_comments = updated_since(
+        Comment.objects.filter(project=project),
+        position.get("comments"),
+        limit,
+    )
+    tombstones = Tombstone.objects.filter(project=project).order_by("id")
+    if "deleted" in position:
+        tombstones = tombstones.filter(id__gt=position["deleted"])
+    tombstones = list(tombstones[: limit + 1])
+    more_deleted = len(tombstones) > limit
+    tombstones = tombstones[:limit]
+
+    # synced_at dates the cursor: tombstones recorded after it are only
+    # pruned once it is older than TOMBSTONE_RETENTION
+    next_position = {"synced_at": timezone.now().isoformat()}
+    for name, rows in [("issues", issues), ("comments", comments)]:
+        last = position.get(name)
+        if rows:
+            last = (rows[-1].updated_at, rows[-1].pk)
+        if last is not None:
+            next_position[name] = [last[0].isoformat(), str(last[1])]
+    deleted = tombstones[-1].id if tombstones else position.get("deleted")
+    if deleted is not None:
+        next_position["deleted"] = deleted
+    return {
+        "issues": issues,
+        "comments": comments,
+        "deleted": tombstones,
+        "cursor": encode_cursor(next_position),
+        "more": more_issues or more_comments or more_deleted,
+    }
+
+
+def represent_tombstone(tombstone):
+    model = TOMBSTONE_MODELS[tombstone.type]
+    return {
+        "type": tombstone.type,
+        "id": model._meta.pk.to_python(tombstone.object_id),
+        "deleted_at": tombstone.deleted_at,
+    }
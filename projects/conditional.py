@@ -0,0 +1,99 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+from softdesk.serializers import (
+    narrow_queryset,
+    ordering_columns,
+    represent_row,
+)
+
+
+def make_etag(request, *parts):
+    # A strong validator for one representation: the URL (page, cursor,
+    # fields...) and the negotiated format are part of it
+    parts += (request.get_full_path(), request.accepted_renderer.format)
+    digest = hashlib.sha1(":".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional_response(request, last_modified, render, *parts):
+    """
+    Answer If-None-Match / If-Modified-Since with a 304 when the validators
+    built from `last_modified` and `parts` match, before `render` is called.
+    """
+    etag = make_etag(request, last_modified, *parts)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timestamp
+    )
+    if response is None:
+        response = render()
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+    return response
+
+
+def collection_validators(queryset):
+    # One aggregate over the whole collection: cheaper than serializing a
+    # page, and the count catches deletions max(updated_at) cannot see
+    aggregate = queryset.order_by().aggregate(
+        last_modified=Max("updated_at"), count=Count("pk")
+    )
+    return aggregate["last_modified"], aggregate["count"]
+
+
+class ConditionalListMixin:
+    """
+    Collection responses with validators from `collection_validators`, so
+    polling clients get a 304 without any page being serialized.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list(self.filter_queryset(self.get_queryset()))
+
+    def conditional_list(self, queryset, serializer_class=None):
+        last_modified, count = collection_validators(queryset)
+        return conditional_response(
+            self.request,
+            last_modified,
+            lambda: self.paginated_response(queryset, serializer_class),
+            count,
+        )
+
+    def paginated_response(self, queryset, serializer_class=None):
+        serializer_class = serializer_class or self.get_serializer_class()
+        if hasattr(serializer_class, "get_values_plan"):
+            plan = serializer_class.get_values_plan(self.request)
+            if plan is not None:
+                return self.values_response(queryset, plan)
+
+        context = self.get_serializer_context()
+        # the serializer declares what its representation reads
+        if hasattr(serializer_class, "setup_eager_loading"):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        queryset = narrow_queryset(
+            queryset,
+            serializer_class(context=context),
+            keep=ordering_columns(self),
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = serializer_class(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = serializer_class(queryset, many=True, context=context)
+        return Response(serializer.data)
+
+    def values_response(self, queryset, plan):
+        columns = {column for _, column, _ in plan}
+        queryset = queryset.values(*columns, *ordering_columns(self))
+        page = self.paginate_queryset(queryset)
+        rows = queryset if page is None else page
+        data = [represent_row(plan, row) for row in rows]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
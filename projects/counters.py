@@ -0,0 +1,62 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from projects.models import Project, Contributor, Issue, Comment
+from projects.caching import invalidate, invalidate_all
+
+STATUS_COUNTERS = {
+    Issue.TODO: "todo_issue_count",
+    Issue.IN_PROGRESS: "in_progress_issue_count",
+    Issue.FINISHED: "finished_issue_count",
+}
+
+
+def bump(model, pk, **deltas):
+    # Counters are part of the representation: touch updated_at and drop
+    # cached responses as well
+    changes = {name: F(name) + delta for name, delta in deltas.items() if delta}
+    if changes:
+        model.objects.filter(pk=pk).update(updated_at=timezone.now(), **changes)
+        invalidate(model, pk)
+
+
+def issue_status_deltas(status, delta):
+    return {STATUS_COUNTERS[status]: delta} if status in STATUS_COUNTERS else {}
+
+
+def count_of(model, related_field, **filters):
+    rows = (
+        model.objects.filter(**{related_field: OuterRef("pk")}, **filters)
+        .order_by()
+        .values(related_field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(rows), Value(0))
+
+
+def refresh_contributor_count(project_ids):
+    Project.objects.filter(pk__in=project_ids).update(
+        contributor_count=count_of(Contributor, "project"),
+        updated_at=timezone.now(),
+    )
+    invalidate(Project, *project_ids)
+
+
+def recompute(project_ids=None):
+    projects = Project.objects.all()
+    issues = Issue.objects.all()
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+        issues = issues.filter(project_id__in=project_ids)
+    issues.update(comment_count=count_of(Comment, "issue"))
+    updated = projects.update(
+        comment_count=count_of(Comment, "issue__project"),
+        contributor_count=count_of(Contributor, "project"),
+        **{
+            name: count_of(Issue, "project", status=status)
+            for status, name in STATUS_COUNTERS.items()
+        },
+    )
+    invalidate_all()
+    return updated
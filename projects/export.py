@@ -0,0 +1,88 @@
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from projects.models import Issue, Comment
+
+CHUNK_SIZE = 2000
+
+PROJECT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "category",
+    "author_id",
+    "created_at",
+    "updated_at",
+]
+ISSUE_FIELDS = [
+    "id",
+    "project_id",
+    "title",
+    "description",
+    "priority",
+    "tag",
+    "status",
+    "author_id",
+    "assigned_to_id",
+    "created_at",
+    "updated_at",
+]
+COMMENT_FIELDS = [
+    "id",
+    "issue_id",
+    "description",
+    "author_id",
+    "created_at",
+    "updated_at",
+]
+CSV_COLUMNS = ["type"] + list(
+    dict.fromkeys(PROJECT_FIELDS + ISSUE_FIELDS + COMMENT_FIELDS)
+)
+
+
+def iter_rows(project):
+    """
+    Yield (type, row) for the project, its issues then their comments.
+    Rows come from server-side cursors over `.values()`, so memory stays
+    flat whatever the size of the project.
+    """
+    yield "project", {name: getattr(project, name) for name in PROJECT_FIELDS}
+    issues = (
+        Issue.objects.filter(project=project)
+        .order_by("created_at", "id")
+        .values(*ISSUE_FIELDS)
+    )
+    for row in issues.iterator(chunk_size=CHUNK_SIZE):
+        yield "issue", row
+    comments = (
+        Comment.objects.filter(issue__project=project)
+        .order_by("issue_id", "created_at", "id")
+        .values(*COMMENT_FIELDS)
+    )
+    for row in comments.iterator(chunk_size=CHUNK_SIZE):
+        yield "comment", row
+
+
+def iter_ndjson(project):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for kind, row in iter_rows(project):
+        yield encoder.encode({"type": kind, **row}) + "\n"
+
+
+class Echo:
+    # file-like object handing back what csv.writer writes
+    def write(self, value):
+        return value
+
+
+def iter_csv(project):
+    writer = csv.DictWriter(Echo(), fieldnames=CSV_COLUMNS)
+    yield writer.writeheader()
+    for kind, row in iter_rows(project):
+        yield writer.writerow({"type": kind, **row})
+
+
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "csv": (iter_csv, "text/csv"),
+}
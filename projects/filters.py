@@ -0,0 +1,105 @@
+import datetime
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+from projects.models import Issue
+from projects.membership import project_scope
+
+# query parameter -> (lookup, accepted values); several values may be
+# given comma separated
+ISSUE_CHOICE_FILTERS = {
+    "status": ("status", Issue.STATUS),
+    "priority": ("priority", Issue.PRIORITIES),
+    "tag": ("tag", Issue.TAGS),
+}
+ISSUE_USER_FILTERS = {
+    "assigned_to": "assigned_to_id",
+    "author": "author_id",
+}
+# query parameter -> lookup, bounds are inclusive
+ISSUE_RANGE_FILTERS = {
+    "created_after": "created_at__gte",
+    "created_before": "created_at__lte",
+    "updated_after": "updated_at__gte",
+    "updated_before": "updated_at__lte",
+}
+# `?ordering=` values, id breaks ties for keyset pagination
+ISSUE_ORDERINGS = {
+    "created_at": ("created_at", "id"),
+    "-created_at": ("-created_at", "-id"),
+    "updated_at": ("updated_at", "id"),
+    "-updated_at": ("-updated_at", "-id"),
+}
+
+
+def get_values(params, name):
+    return [value for value in params.get(name, "").split(",") if value]
+
+
+def parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError
+        moment = datetime.datetime.combine(day, datetime.time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_issues(queryset, params):
+    """
+    Apply the filters found in `params` (query parameters) to `queryset`.
+    Raises a ValidationError listing every invalid parameter.
+    """
+    lookups, errors = {}, {}
+    for name, (lookup, choices) in ISSUE_CHOICE_FILTERS.items():
+        values = get_values(params, name)
+        allowed = [choice for choice, _ in choices]
+        if any(value not in allowed for value in values):
+            errors[name] = f"Valeurs possibles : {", ".join(allowed)}"
+        elif values:
+            lookups[f"{lookup}__in"] = values
+    for name, lookup in ISSUE_USER_FILTERS.items():
+        values = get_values(params, name)
+        if not all(value.isdigit() for value in values):
+            errors[name] = "Identifiants d'utilisateurs invalides"
+        elif values:
+            lookups[f"{lookup}__in"] = [int(value) for value in values]
+    for name, lookup in ISSUE_RANGE_FILTERS.items():
+        if name not in params:
+            continue
+        try:
+            lookups[lookup] = parse_moment(params[name])
+        except ValueError:
+            errors[name] = "Date invalide, format attendu : AAAA-MM-JJ[THH:MM]"
+    if errors:
+        raise serializers.ValidationError(errors)
+    return queryset.filter(**lookups)
+
+
+def issue_ordering(params, default="created_at"):
+    ordering = params.get("ordering", default)
+    if ordering not in ISSUE_ORDERINGS:
+        raise serializers.ValidationError(
+            {"ordering": f"Valeurs possibles : {", ".join(ISSUE_ORDERINGS)}"}
+        )
+    return ISSUE_ORDERINGS[ordering]
+
+
+def user_issues(user, role=None):
+    """
+    Issues `user` is assigned to in projects they belong to, or authored
+    (`role` "assigned" or "authored" for only one of them).
+    """
+    assigned = user.assigned_issues.filter(project_scope(user, "project__"))
+    if role == "assigned":
+        return assigned
+    if role == "authored":
+        return user.created_issues.all()
+    if role is not None:
+        raise serializers.ValidationError(
+            {"role": "Valeurs possibles : assigned, authored"}
+        )
+    return assigned | user.created_issues.all()
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from projects.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete tombstones older than the changes feed retention period"
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstone(s)"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from projects.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text index of issues and comments"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            get_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS("Rebuilt the search index"))
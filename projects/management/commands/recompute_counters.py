@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from projects.counters import recompute
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized issue, comment and contributor counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "project_ids",
+            nargs="*",
+            type=int,
+            help="Only recompute these projects (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = recompute(options["project_ids"] or None)
+        self.stdout.write(
+            self.style.SUCCESS(f"Recomputed counters of {updated} project(s)")
+        )
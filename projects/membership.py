@@ -0,0 +1,46 @@
+from django.db.models import Q
+from projects.models import Contributor
+
+
+def get_member_project_ids(request):
+    # Ids of the projects the current user contributes to, loaded once per
+    # request and shared by permissions, viewset actions and serializers
+    if not hasattr(request, "_member_project_ids"):
+        request._member_project_ids = frozenset(
+            Contributor.objects.filter(user_id=request.user.pk).values_list(
+                "project_id", flat=True
+            )
+        )
+    return request._member_project_ids
+
+
+def is_member(request, project_id):
+    return project_id in get_member_project_ids(request)
+
+
+def is_author_or_member(request, author_id, project_id):
+    return author_id == request.user.pk or is_member(request, project_id)
+
+
+def can_view(request, author_id, project_id):
+    return request.user.is_superuser or is_author_or_member(
+        request, author_id, project_id
+    )
+
+
+def is_project_member(user_id, project_id):
+    # Single indexed existence query, for users other than the current one
+    return Contributor.objects.filter(
+        user_id=user_id, project_id=project_id
+    ).exists()
+
+
+def project_scope(user, prefix=""):
+    # Projects `user` authored or contributes to, as one semi-join on the
+    # (user, project) unique index; `prefix` reaches them from related rows
+    memberships = Contributor.objects.filter(user_id=user.pk).values(
+        "project_id"
+    )
+    return Q(**{f"{prefix}author_id": user.pk}) | Q(
+        **{f"{prefix}pk__in": memberships}
+    )
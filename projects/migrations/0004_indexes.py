@@ -0,0 +1,63 @@
+# Generated by Django 5.0.7 on 2026-10-18 06:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_contributors(apps, schema_editor):
+    Contributor = apps.get_model("projects", "Contributor")
+    seen = set()
+    duplicates = []
+    for pk, user_id, project_id in Contributor.objects.order_by("pk").values_list(
+        "pk", "user_id", "project_id"
+    ):
+        if (user_id, project_id) in seen:
+            duplicates.append(pk)
+        seen.add((user_id, project_id))
+    Contributor.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_comment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='issue',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='projects.issue'),
+        ),
+        migrations.AlterField(
+            model_name='contributor',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='issue',
+            name='project',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='projects.project'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['issue', 'created_at', 'id'], name='comment_issue_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='issue_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['assigned_to', 'status'], name='issue_assignee_status_idx'),
+        ),
+        migrations.RunPython(
+            remove_duplicate_contributors, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='contributor',
+            constraint=models.UniqueConstraint(fields=('user', 'project'), name='unique_project_contributor'),
+        ),
+    ]
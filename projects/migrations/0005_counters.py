@@ -0,0 +1,72 @@
+# Generated by Django 5.0.7 on 2026-10-18 06:31
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_of(model, related_field, **filters):
+    rows = (
+        model.objects.filter(**{related_field: OuterRef("pk")}, **filters)
+        .order_by()
+        .values(related_field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(rows), Value(0))
+
+
+def backfill_counters(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    Contributor = apps.get_model("projects", "Contributor")
+    Issue = apps.get_model("projects", "Issue")
+    Comment = apps.get_model("projects", "Comment")
+    Issue.objects.update(comment_count=count_of(Comment, "issue"))
+    Project.objects.update(
+        todo_issue_count=count_of(Issue, "project", status="to-do"),
+        in_progress_issue_count=count_of(Issue, "project", status="in-progress"),
+        finished_issue_count=count_of(Issue, "project", status="finished"),
+        comment_count=count_of(Comment, "issue__project"),
+        contributor_count=count_of(Contributor, "project"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='contributor_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='finished_issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
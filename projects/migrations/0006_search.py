@@ -0,0 +1,130 @@
+from django.db import migrations
+
+# Full-text indexes kept up to date by the database itself, so bulk_create,
+# bulk_update and queryset updates are indexed like regular saves.
+
+SQLITE_FORWARDS = [
+    # Issues are indexed by their integer primary key. Comments have a UUID
+    # key and are indexed by their rowid: run rebuild_search_index after a
+    # VACUUM, which may renumber it.
+    """
+    CREATE VIRTUAL TABLE projects_issue_fts USING fts5(
+        title, description,
+        content='projects_issue', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER projects_issue_fts_insert AFTER INSERT ON projects_issue
+    BEGIN
+        INSERT INTO projects_issue_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER projects_issue_fts_delete AFTER DELETE ON projects_issue
+    BEGIN
+        INSERT INTO projects_issue_fts (projects_issue_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER projects_issue_fts_update
+    AFTER UPDATE OF title, description ON projects_issue
+    BEGIN
+        INSERT INTO projects_issue_fts (projects_issue_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO projects_issue_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO projects_issue_fts (projects_issue_fts) VALUES ('rebuild')",
+    """
+    CREATE VIRTUAL TABLE projects_comment_fts USING fts5(
+        description,
+        content='projects_comment', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER projects_comment_fts_insert AFTER INSERT ON projects_comment
+    BEGIN
+        INSERT INTO projects_comment_fts (rowid, description)
+        VALUES (new.rowid, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER projects_comment_fts_delete AFTER DELETE ON projects_comment
+    BEGIN
+        INSERT INTO projects_comment_fts (projects_comment_fts, rowid, description)
+        VALUES ('delete', old.rowid, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER projects_comment_fts_update
+    AFTER UPDATE OF description ON projects_comment
+    BEGIN
+        INSERT INTO projects_comment_fts (projects_comment_fts, rowid, description)
+        VALUES ('delete', old.rowid, old.description);
+        INSERT INTO projects_comment_fts (rowid, description)
+        VALUES (new.rowid, new.description);
+    END
+    """,
+    "INSERT INTO projects_comment_fts (projects_comment_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER projects_comment_fts_update",
+    "DROP TRIGGER projects_comment_fts_delete",
+    "DROP TRIGGER projects_comment_fts_insert",
+    "DROP TABLE projects_comment_fts",
+    "DROP TRIGGER projects_issue_fts_update",
+    "DROP TRIGGER projects_issue_fts_delete",
+    "DROP TRIGGER projects_issue_fts_insert",
+    "DROP TABLE projects_issue_fts",
+]
+
+POSTGRESQL_FORWARDS = [
+    """
+    ALTER TABLE projects_issue ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX projects_issue_search_idx ON projects_issue USING GIN (search_vector)",
+    """
+    ALTER TABLE projects_comment ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(description, ''))
+    ) STORED
+    """,
+    "CREATE INDEX projects_comment_search_idx ON projects_comment USING GIN (search_vector)",
+]
+
+POSTGRESQL_BACKWARDS = [
+    "ALTER TABLE projects_comment DROP COLUMN search_vector",
+    "ALTER TABLE projects_issue DROP COLUMN search_vector",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0005_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({"sqlite": SQLITE_FORWARDS, "postgresql": POSTGRESQL_FORWARDS}),
+            run({"sqlite": SQLITE_BACKWARDS, "postgresql": POSTGRESQL_BACKWARDS}),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.7 on 2026-10-18 07:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_issue_project(apps, schema_editor):
+    Comment = apps.get_model("projects", "Comment")
+    Issue = apps.get_model("projects", "Issue")
+    Comment.objects.update(
+        project_id=Subquery(
+            Issue.objects.filter(pk=OuterRef("issue_id")).values("project_id")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_tombstones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_updated_idx',
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='project',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project'),
+        ),
+        migrations.RunPython(copy_issue_project, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['project', 'updated_at', 'id'], name='comment_project_updated_idx'),
+        ),
+    ]
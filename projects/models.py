@@ -1,9 +1,24 @@
 import uuid
 import time
-from django.db import models
+from django.db import models, transaction
 from users.models import get_sentinel_user, User
 
 
+def exclude_counters(instance, kwargs):
+    # Counters are only written through projects.counters: leave them out of
+    # regular updates so a stale in-memory value never overwrites them
+    if not instance._state.adding and kwargs.get("update_fields") is None:
+        skipped = set(instance.COUNTER_FIELDS) | instance.get_deferred_fields()
+        kwargs["update_fields"] = [
+            field.name
+            for field in instance._meta.concrete_fields
+            if not field.primary_key
+            and field.name not in skipped
+            and field.attname not in skipped
+        ]
+    return kwargs
+
+
 class Project(models.Model):
     BACKEND = "back-end"
     FRONTEND = "front-end"
@@ -29,15 +44,44 @@ class Project(models.Model):
         default=None,
     )
     contributors = models.ManyToManyField(User, through="Contributor")
+    # denormalized counters, maintained by projects.signals
+    todo_issue_count = models.PositiveIntegerField(default=0, editable=False)
+    in_progress_issue_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+    finished_issue_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    contributor_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = (
+        "todo_issue_count",
+        "in_progress_issue_count",
+        "finished_issue_count",
+        "comment_count",
+        "contributor_count",
+    )
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **exclude_counters(self, kwargs))
+
 
 class Contributor(models.Model):
-    user = models.ForeignKey(User, on_delete=models.SET(get_sentinel_user)) # type: ignore
+    # indexed by the (user, project) unique constraint
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     project = models.ForeignKey(Project, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "project"], name="unique_project_contributor"
+            ),
+        ]
+
 
 class Issue(models.Model):
     LOW = "low"
@@ -64,7 +108,10 @@ class Issue(models.Model):
         (IN_PROGRESS, "In Progress"),
         (FINISHED, "Finished"),
     ]
-    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    # indexed by the (project, created_at, id) index
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, db_index=False
+    )
     author = models.ForeignKey(
         User,
         related_name="created_issues",
@@ -85,14 +132,130 @@ class Issue(models.Model):
     status = models.CharField(
         choices=STATUS, default=TODO, max_length=11
     )
+    # denormalized counter, maintained by projects.signals
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = ("comment_count",)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "created_at", "id"],
+                name="issue_project_created_idx",
+            ),
+            # ?status= and ?ordering=updated_at on a project's issues
+            models.Index(
+                fields=["project", "status", "created_at", "id"],
+                name="issue_project_status_idx",
+            ),
+            models.Index(
+                fields=["project", "updated_at", "id"],
+                name="issue_project_updated_idx",
+            ),
+            # the current user's feed, see IssueViewSet.mine
+            models.Index(
+                fields=["assigned_to", "status", "updated_at"],
+                name="issue_assignee_updated_idx",
+            ),
+            models.Index(
+                fields=["author", "updated_at"],
+                name="issue_author_updated_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember what the project counters currently account for
+        if "project_id" in instance.__dict__ and "status" in instance.__dict__:
+            instance._counted_as = (instance.project_id, instance.status)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # keep the row and the counters updated by post_save in sync
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **exclude_counters(self, kwargs))
+
 
 class Comment(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    issue = models.ForeignKey("projects.Issue", related_name="comments", on_delete=models.CASCADE)
+    # indexed by the (issue, created_at, id) index
+    issue = models.ForeignKey("projects.Issue", related_name="comments", on_delete=models.CASCADE, db_index=False)
     author = models.ForeignKey("users.User", related_name="comments", on_delete=models.SET(get_sentinel_user), default=None) # type: ignore
+    # the issue's project, so the changes feed reads one project's comments
+    # through the (project, updated_at, id) index; set by save
+    project = models.ForeignKey(
+        Project,
+        related_name="+",
+        on_delete=models.CASCADE,
+        null=True,
+        db_index=False,
+    )
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["issue", "created_at", "id"],
+                name="comment_issue_created_idx",
+            ),
+            # changes feed, see projects.changes
+            models.Index(
+                fields=["project", "updated_at", "id"],
+                name="comment_project_updated_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember which issue the counters currently account for
+        if "issue_id" in instance.__dict__:
+            instance._counted_as = instance.issue_id
+        return instance
+
+    def save(self, *args, **kwargs):
+        # a new issue is always assigned through the relation, which caches it
+        if self.project_id is None or Comment.issue.is_cached(self):
+            self.project_id = self.issue.project_id
+        # keep the row and the counters updated by post_save in sync
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted issue or comment, so clients syncing a project
+    through its changes feed learn about deletions. Comments deleted along
+    with their issue get no tombstone of their own.
+    """
+
+    ISSUE = "issue"
+    COMMENT = "comment"
+    TYPES = [
+        (ISSUE, "Issue"),
+        (COMMENT, "Comment"),
+    ]
+    # indexed by the (project, id) index
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, db_index=False
+    )
+    type = models.CharField(choices=TYPES, max_length=7)
+    object_id = models.CharField(max_length=36)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "id"],
+                name="tombstone_project_idx",
+            ),
+            models.Index(
+                fields=["deleted_at"],
+                name="tombstone_deleted_idx",
+            ),
+        ]
@@ -1,6 +1,10 @@
 from rest_framework import permissions
 from projects.models import Project, Issue
-from users.models import User
+from projects.membership import (
+    can_view,
+    is_author_or_member,
+    is_project_member,
+)
 
 
 class ProjectPermission(permissions.BasePermission):
@@ -24,13 +28,9 @@ class ProjectPermission(permissions.BasePermission):
             return False
 
         if view.action == "retrieve":
-            return (
-                obj.author == request.user
-                or request.user in obj.contributors.all()
-                or request.user.is_superuser
-            )
+            return can_view(request, obj.author_id, obj.pk)
         elif view.action in ["update", "partial_update", "destroy"]:
-            return obj.author == request.user or request.user.is_superuser
+            return obj.author_id == request.user.pk or request.user.is_superuser
         else:
             return False
 
@@ -43,14 +43,12 @@ class IssuePermission(permissions.BasePermission):
         elif view.action == "create":
             project_pk = request.data.__getitem__("project")
             project = Project.objects.get(pk=project_pk)
-            if project and (
-                project.author == request.user
-                or request.user in project.contributors.all()
+            if is_author_or_member(
+                request, project.author_id, project.pk
             ):
-                assigned_to = User.objects.get(
-                    pk=request.data.get("assigned_to")
+                return is_project_member(
+                    request.data.get("assigned_to"), project.pk
                 )
-                return assigned_to in project.contributors.all()
             return False
         if view.action in [
             "retrieve",
@@ -68,13 +66,9 @@ class IssuePermission(permissions.BasePermission):
             return False
 
         if view.action == "retrieve":
-            return (
-                obj.author == request.user
-                or request.user in obj.project.contributors.all()
-                or request.user.is_superuser
-            )
+            return can_view(request, obj.author_id, obj.project_id)
         elif view.action in ["update", "partial_update", "destroy"]:
-            return obj.author == request.user or request.user.is_superuser
+            return obj.author_id == request.user.pk or request.user.is_superuser
         else:
             return False
 
@@ -87,12 +81,9 @@ class CommentPermission(permissions.BasePermission):
         elif view.action == "create":
             issue_pk = request.data.__getitem__("issue")
             issue = Issue.objects.get(pk=issue_pk)
-            if issue and (
-                issue.author == request.user
-                or request.user in issue.project.contributors.all()
-            ):
-                return True
-            return False
+            return is_author_or_member(
+                request, issue.author_id, issue.project_id
+            )
         if view.action in [
             "retrieve",
             "update",
@@ -109,12 +100,8 @@ class CommentPermission(permissions.BasePermission):
             return False
 
         if view.action == "retrieve":
-            return (
-                obj.author == request.user
-                or request.user in obj.issue.project.contributors.all()
-                or request.user.is_superuser
-            )
+            return can_view(request, obj.author_id, obj.issue.project_id)
         elif view.action in ["update", "partial_update", "destroy"]:
-            return obj.author == request.user or request.user.is_superuser
+            return obj.author_id == request.user.pk or request.user.is_superuser
         else:
             return False
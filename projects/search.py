@@ -0,0 +1,132 @@
+import operator
+import re
+from functools import reduce
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_LIMIT = 20
+
+
+class SearchBackend:
+    """
+    Ranked full-text matching of issues and comments. Backends filter a
+    queryset to the rows matching `query`, best matches first; the indexes
+    themselves are maintained by the database (see migration 0006_search).
+    """
+
+    def search_issues(self, queryset, query):
+        raise NotImplementedError
+
+    def search_comments(self, queryset, query):
+        raise NotImplementedError
+
+    def rebuild(self):
+        pass
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    FTS5 external content tables, ranked by bm25 with titles weighing more
+    than descriptions.
+    """
+
+    def match_query(self, query):
+        # every word must match, quoted so user input is never FTS syntax
+        words = re.findall(r"\w+", query)
+        return " ".join('"{}"*'.format(word) for word in words)
+
+    def search(self, queryset, query, index, rowid, weights):
+        match = self.match_query(query)
+        if not match:
+            return queryset.none()
+        table = queryset.model._meta.db_table
+        matches = RawSQL(
+            f'"{table}"."{rowid}" IN '
+            f"(SELECT rowid FROM {index} WHERE {index} MATCH %s)",
+            (match,),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"(SELECT bm25({index}, {weights}) FROM {index}"
+            f' WHERE {index} MATCH %s AND rowid = "{table}"."{rowid}")',
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).alias(rank=rank).order_by("rank")
+
+    def search_issues(self, queryset, query):
+        return self.search(
+            queryset, query, "projects_issue_fts", "id", "10.0, 1.0"
+        )
+
+    def search_comments(self, queryset, query):
+        return self.search(
+            queryset, query, "projects_comment_fts", "rowid", "1.0"
+        )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            for index in ["projects_issue_fts", "projects_comment_fts"]:
+                cursor.execute(
+                    f"INSERT INTO {index} ({index}) VALUES ('rebuild')"
+                )
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """
+    Generated tsvector columns with GIN indexes, ranked by ts_rank.
+    """
+
+    def search(self, queryset, query):
+        table = queryset.model._meta.db_table
+        vector = f'"{table}"."search_vector"'
+        tsquery = "websearch_to_tsquery('simple', %s)"
+        matches = RawSQL(
+            f"{vector} @@ {tsquery}", (query,), output_field=BooleanField()
+        )
+        rank = RawSQL(
+            f"ts_rank({vector}, {tsquery})", (query,), output_field=FloatField()
+        )
+        return queryset.filter(matches).alias(rank=rank).order_by("-rank")
+
+    def search_issues(self, queryset, query):
+        return self.search(queryset, query)
+
+    def search_comments(self, queryset, query):
+        return self.search(queryset, query)
+
+
+class ContainsSearchBackend(SearchBackend):
+    """
+    Unindexed substring matching, for databases without a backend above.
+    """
+
+    def search(self, queryset, query, fields):
+        words = query.split()
+        if not words:
+            return queryset.none()
+        for word in words:
+            queryset = queryset.filter(
+                reduce(
+                    operator.or_,
+                    (Q(**{f"{field}__icontains": word}) for field in fields),
+                )
+            )
+        return queryset.order_by("-created_at")
+
+    def search_issues(self, queryset, query):
+        return self.search(queryset, query, ["title", "description"])
+
+    def search_comments(self, queryset, query):
+        return self.search(queryset, query, ["description"])
+
+
+BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgreSQLSearchBackend,
+}
+
+
+def get_backend():
+    return BACKENDS.get(connection.vendor, ContainsSearchBackend)()
@@ -1,15 +1,58 @@
 from rest_framework import serializers
 from projects.models import Project, Issue, Comment
 from users.models import User
+from projects.membership import can_view
+from softdesk.serializers import (
+    SparseFieldsetMixin,
+    ValuesRepresentationMixin,
+)
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class EagerLoadingMixin:
+    """
+    Relations read by the representation, loaded with each page of results
+    instead of once per object. Related fields rendered as primary keys
+    read the foreign key column and need no entry.
+    """
+
+    select_related = ()
+    prefetch_related = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        if cls.select_related:
+            queryset = queryset.select_related(*cls.select_related)
+        if cls.prefetch_related:
+            queryset = queryset.prefetch_related(*cls.prefetch_related)
+        return queryset
+
+
+class ProjectListSerializer(
+    SparseFieldsetMixin,
+    ValuesRepresentationMixin,
+    EagerLoadingMixin,
+    serializers.ModelSerializer,
+):
     class Meta:
         model = Project
-        fields = ["id", "title", "description", "category"]
+        fields = [
+            "id",
+            "title",
+            "description",
+            "category",
+            "todo_issue_count",
+            "in_progress_issue_count",
+            "finished_issue_count",
+            "comment_count",
+            "contributor_count",
+        ]
+
 
+class ProjectSerializer(
+    SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer
+):
+    prefetch_related = ("contributors",)
 
-class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = "__all__"
@@ -25,13 +68,73 @@ class ContributorSerializer(serializers.ModelSerializer):
         fields = ["contributor_ids"]
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(
+    SparseFieldsetMixin,
+    ValuesRepresentationMixin,
+    EagerLoadingMixin,
+    serializers.ModelSerializer,
+):
     class Meta:
         model = Issue
         fields = "__all__"
 
+    def validate_project(self, project):
+        request = self.context["request"]
+        if can_view(request, project.author_id, project.pk):
+            return project
+        raise serializers.ValidationError(
+            "Vous ne faites pas partie de ce projet"
+        )
+
+
+class IssueBatchItemSerializer(IssueSerializer):
+    # checked against the project's contributors, loaded once per batch
+    assigned_to = serializers.IntegerField(source="assigned_to_id")
+
+    class Meta(IssueSerializer.Meta):
+        read_only_fields = ["project", "author"]
+
+    def validate_assigned_to(self, user_id):
+        if user_id in self.context["contributor_ids"]:
+            return user_id
+        raise serializers.ValidationError(
+            "L'utilisateur assigné ne fait pas partie de ce projet"
+        )
+
 
-class CommentSerializer(serializers.ModelSerializer):
+class IssueBatchSerializer(serializers.Serializer):
+    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    create = serializers.ListField(child=serializers.DictField(), default=list)
+    update = serializers.ListField(child=serializers.DictField(), default=list)
+    delete = serializers.ListField(
+        child=serializers.IntegerField(), default=list
+    )
+
+
+class CommentSerializer(
+    SparseFieldsetMixin,
+    ValuesRepresentationMixin,
+    EagerLoadingMixin,
+    serializers.ModelSerializer,
+):
     class Meta:
         model = Comment
-        fields = "__all__"
+        # project is a copy of the issue's, for the changes feed
+        exclude = ["project"]
+
+    def validate_issue(self, issue):
+        request = self.context["request"]
+        if can_view(request, issue.author_id, issue.project_id):
+            return issue
+        raise serializers.ValidationError(
+            "Vous ne faites pas partie de ce projet"
+        )
+
+
+class CommentBatchItemSerializer(serializers.ModelSerializer):
+    # ids may be generated by the client, to retry a batch safely
+    id = serializers.UUIDField(required=False)
+
+    class Meta:
+        model = Comment
+        fields = ["id", "description"]
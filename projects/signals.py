@@ -0,0 +1,200 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+from projects.models import Project, Contributor, Issue, Comment, Tombstone
+from users.models import User
+from projects.counters import bump, issue_status_deltas, refresh_contributor_count
+from projects.caching import invalidate, invalidate_all
+
+
+def is_cascade_from(origin, model):
+    # True when the deletion was started on a parent that goes away too
+    return isinstance(origin, model) or getattr(origin, "model", None) is model
+
+
+@receiver(pre_save, sender=Issue)
+def remember_counted_issue(sender, instance, raw, **kwargs):
+    # instances not loaded from the database (see Issue.from_db)
+    if raw or instance._state.adding or hasattr(instance, "_counted_as"):
+        return
+    instance._counted_as = (
+        Issue.objects.filter(pk=instance.pk)
+        .values_list("project_id", "status")
+        .first()
+    )
+
+
+def move_comments(issue, old_project_id):
+    comments = Comment.objects.filter(issue_id=issue.pk)
+    # cached comments keep the project they were authorized against
+    invalidate(Comment, *comments.values_list("pk", flat=True))
+    # the new project's changes feed reports the comments, the old one
+    # reports the issue as gone, along with its comments
+    comments.update(project_id=issue.project_id, updated_at=timezone.now())
+    Tombstone.objects.create(
+        project_id=old_project_id,
+        type=Tombstone.ISSUE,
+        object_id=str(issue.pk),
+    )
+
+
+@receiver(post_save, sender=Issue)
+def count_saved_issue(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    counted_as = getattr(instance, "_counted_as", None)
+    current = (instance.project_id, instance.status)
+    if created:
+        bump(
+            Project,
+            instance.project_id,
+            **issue_status_deltas(instance.status, 1),
+        )
+    elif counted_as is not None and counted_as != current:
+        old_project_id, old_status = counted_as
+        if old_project_id == instance.project_id:
+            deltas = issue_status_deltas(old_status, -1)
+            for name, delta in issue_status_deltas(instance.status, 1).items():
+                deltas[name] = deltas.get(name, 0) + delta
+            bump(Project, instance.project_id, **deltas)
+        else:
+            move_comments(instance, old_project_id)
+            bump(
+                Project,
+                old_project_id,
+                comment_count=-instance.comment_count,
+                **issue_status_deltas(old_status, -1),
+            )
+            bump(
+                Project,
+                instance.project_id,
+                comment_count=instance.comment_count,
+                **issue_status_deltas(instance.status, 1),
+            )
+    instance._counted_as = current
+
+
+@receiver(post_delete, sender=Issue)
+def count_deleted_issue(sender, instance, origin, **kwargs):
+    if is_cascade_from(origin, Project):
+        return
+    # comments cascading from this issue are accounted for here, at once
+    bump(
+        Project,
+        instance.project_id,
+        comment_count=-instance.comment_count,
+        **issue_status_deltas(instance.status, -1),
+    )
+
+
+@receiver(pre_save, sender=Comment)
+def remember_counted_comment(sender, instance, raw, **kwargs):
+    # instances not loaded from the database (see Comment.from_db)
+    if raw or instance._state.adding or hasattr(instance, "_counted_as"):
+        return
+    instance._counted_as = (
+        Comment.objects.filter(pk=instance.pk)
+        .values_list("issue_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    counted_as = getattr(instance, "_counted_as", None)
+    if created:
+        bump(Issue, instance.issue_id, comment_count=1)
+        bump(Project, instance.issue.project_id, comment_count=1)
+    elif counted_as is not None and counted_as != instance.issue_id:
+        old_project_id = Issue.objects.values_list(
+            "project_id", flat=True
+        ).get(pk=counted_as)
+        bump(Issue, counted_as, comment_count=-1)
+        bump(Project, old_project_id, comment_count=-1)
+        bump(Issue, instance.issue_id, comment_count=1)
+        bump(Project, instance.issue.project_id, comment_count=1)
+        if old_project_id != instance.issue.project_id:
+            # gone from the old project's changes feed
+            Tombstone.objects.create(
+                project_id=old_project_id,
+                type=Tombstone.COMMENT,
+                object_id=str(instance.pk),
+            )
+    instance._counted_as = instance.issue_id
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin, **kwargs):
+    if is_cascade_from(origin, Issue) or is_cascade_from(origin, Project):
+        return
+    bump(Issue, instance.issue_id, comment_count=-1)
+    bump(Project, instance.issue.project_id, comment_count=-1)
+
+
+@receiver(m2m_changed, sender=Project.contributors.through)
+def count_contributors(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            refresh_contributor_count([instance.pk])
+    # instance is a user and pk_set holds project ids, except when clearing
+    elif action == "pre_clear":
+        instance._cleared_project_ids = list(
+            instance.project_set.values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        refresh_contributor_count(instance._cleared_project_ids)
+    elif action in ("post_add", "post_remove"):
+        refresh_contributor_count(list(pk_set))
+
+
+@receiver(post_delete, sender=Contributor)
+def count_deleted_contributor(sender, instance, origin, **kwargs):
+    # membership rows removed along with a deleted user account
+    if is_cascade_from(origin, User):
+        refresh_contributor_count([instance.project_id])
+
+
+@receiver(post_delete, sender=Issue)
+def record_deleted_issue(sender, instance, origin, **kwargs):
+    if is_cascade_from(origin, Project):
+        return
+    Tombstone.objects.create(
+        project_id=instance.project_id,
+        type=Tombstone.ISSUE,
+        object_id=str(instance.pk),
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def record_deleted_comment(sender, instance, origin, **kwargs):
+    # comments going away with their issue are implied by its tombstone
+    if is_cascade_from(origin, Issue) or is_cascade_from(origin, Project):
+        return
+    Tombstone.objects.create(
+        project_id=instance.issue.project_id,
+        type=Tombstone.COMMENT,
+        object_id=str(instance.pk),
+    )
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Issue)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Issue)
+@receiver(post_delete, sender=Comment)
+def drop_cached_response(sender, instance, **kwargs):
+    invalidate(sender, instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def drop_cached_responses(sender, instance, **kwargs):
+    # rows of a deleted user are reassigned without sending signals
+    invalidate_all()
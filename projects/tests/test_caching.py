@@ -0,0 +1,130 @@
+import json
+from unittest import mock
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from projects.models import Comment, Issue
+from projects.views import IssueViewSet
+
+
+class ResponseCacheTest(APITestCase):
+    def setUp(self):
+        url = reverse("user-list")
+        for username in ["Billy", "Joe", "Jimbob"]:
+            self.client.post(url, {
+                "username": username,
+                "password": "password123",
+                "birth_date": "2000-01-01",
+            }, format="json")
+        url = reverse("token_obtain_pair")
+        self.bearers = {}
+        for username in ["Billy", "Joe", "Jimbob"]:
+            response = self.client.post(
+                url,
+                {"username": username, "password": "password123"},
+                format="json",
+            )
+            self.bearers[username] = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(reverse("project-list"), {}, headers={"Authorization": self.bearers["Billy"]})
+        self.client.post(
+            "http://testserver/projects/1/add_contributors/",
+            { "contributor_ids": [2] },
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        self.client.post(
+            reverse("issue-list"),
+            {
+                "project": 1,
+                "title": "Issue 1",
+                "assigned_to": 2,
+            },
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        return super().setUp()
+
+    def get_issue(self, username):
+        return self.client.get(reverse("issue-detail", kwargs={"pk": 1}), headers={"Authorization": self.bearers[username]})
+
+    def test_cache_hit_skips_object_query(self):
+        self.get_issue("Joe")
+        # membership lookup only: the user comes from the token claims
+        with self.assertNumQueries(1):
+            response = self.get_issue("Joe")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)["title"], "Issue 1")
+
+    def test_cache_hit_still_checks_permissions(self):
+        self.get_issue("Joe")
+        response = self.get_issue("Jimbob")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(reverse("issue-detail", kwargs={"pk": 1}))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_update_invalidates_cached_response(self):
+        self.get_issue("Billy")
+        self.client.patch(
+            reverse("issue-detail", kwargs={"pk": 1}),
+            {"title": "Renamed"},
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        self.assertEqual(json.loads(self.get_issue("Billy").content)["title"], "Renamed")
+
+    def test_response_read_before_commit_is_not_served_after(self):
+        before = Issue.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("issue-detail", kwargs={"pk": 1}),
+                {"title": "Renamed"},
+                headers={"Authorization": self.bearers["Billy"]}
+            )
+            # another connection still reads the committed row
+            with mock.patch.object(IssueViewSet, "get_object", return_value=before):
+                self.assertEqual(json.loads(self.get_issue("Billy").content)["title"], "Issue 1")
+        self.assertEqual(json.loads(self.get_issue("Billy").content)["title"], "Renamed")
+
+    def test_contributors_change_invalidates_cached_project(self):
+        url = reverse("project-detail", kwargs={"pk": 1})
+        self.client.get(url, headers={"Authorization": self.bearers["Billy"]})
+        self.client.post(
+            "http://testserver/projects/1/add_contributors/",
+            { "contributor_ids": [3] },
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        response = self.client.get(url, headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(sorted(json.loads(response.content)["contributors"]), [1, 2, 3])
+        response = self.client.get(url, headers={"Authorization": self.bearers["Jimbob"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_moved_issue_comments_are_not_served_from_cache(self):
+        self.client.post(
+            reverse("comment-list"),
+            {"issue": 1, "description": "Lorem ipsum"},
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        url = reverse("comment-detail", kwargs={"pk": Comment.objects.get().pk})
+        response = self.client.get(url, headers={"Authorization": self.bearers["Joe"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Joe does not contribute to project 2
+        self.client.post(reverse("project-list"), {}, headers={"Authorization": self.bearers["Billy"]})
+        response = self.client.patch(
+            reverse("issue-detail", kwargs={"pk": 1}),
+            {"project": 2, "assigned_to": 1},
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_issue("Joe").status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(url, headers={"Authorization": self.bearers["Joe"]})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deleted_object_is_not_served_from_cache(self):
+        self.get_issue("Billy")
+        self.client.delete(reverse("issue-detail", kwargs={"pk": 1}), headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(self.get_issue("Billy").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_sparse_fieldset_is_not_cached_as_full_response(self):
+        url = reverse("issue-detail", kwargs={"pk": 1})
+        response = self.client.get(url, {"fields": "id,title"}, headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(json.loads(response.content), {"id": 1, "title": "Issue 1"})
+        self.assertIn("description", json.loads(self.get_issue("Billy").content))
+        response = self.client.get(url, {"omit": "description"}, headers={"Authorization": self.bearers["Billy"]})
+        self.assertNotIn("description", json.loads(response.content))
@@ -0,0 +1,142 @@
+import base64
+import datetime
+import io
+import json
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from projects.models import Comment, Tombstone
+
+
+class ChangesFeedTest(APITestCase):
+    def setUp(self):
+        url = reverse("user-list")
+        for username in ["Billy", "Joe"]:
+            self.client.post(url, {
+                "username": username,
+                "password": "password123",
+                "birth_date": "2000-01-01",
+            }, format="json")
+        url = reverse("token_obtain_pair")
+        self.bearers = {}
+        for username in ["Billy", "Joe"]:
+            response = self.client.post(
+                url,
+                {"username": username, "password": "password123"},
+                format="json",
+            )
+            self.bearers[username] = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(reverse("project-list"), {}, headers={"Authorization": self.bearers["Billy"]})
+        self.client.post(
+            reverse("issue-bulk"),
+            {"project": 1, "create": [{"title": f"Issue {i}", "assigned_to": 1} for i in range(5)]},
+            format="json",
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        self.client.post(
+            reverse("issue-comments", kwargs={"pk": 1}),
+            [{"description": "Premier"}, {"description": "Second"}],
+            format="json",
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        return super().setUp()
+
+    def changes(self, cursor=None, project=1, **params):
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get(
+            reverse("project-changes", kwargs={"pk": project}), params,
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def sync(self, cursor=None, project=1):
+        issues, comments, deleted = [], [], []
+        while True:
+            content = self.changes(cursor, project, page_size=2)
+            issues += [issue["title"] for issue in content["issues"]]
+            comments += [comment["description"] for comment in content["comments"]]
+            deleted += [(row["type"], row["id"]) for row in content["deleted"]]
+            cursor = content["cursor"]
+            if not content["more"]:
+                return cursor, issues, comments, deleted
+
+    def test_initial_sync_in_batches_then_only_changes(self):
+        cursor, issues, comments, deleted = self.sync()
+        self.assertEqual(sorted(issues), [f"Issue {i}" for i in range(5)])
+        self.assertEqual(sorted(comments), ["Premier", "Second"])
+        self.assertEqual(deleted, [])
+
+        cursor, issues, comments, deleted = self.sync(cursor)
+        self.assertEqual((issues, comments, deleted), ([], [], []))
+
+        self.client.patch(reverse("issue-detail", kwargs={"pk": 3}), {"title": "Renamed"}, headers={"Authorization": self.bearers["Billy"]})
+        self.client.delete(reverse("issue-detail", kwargs={"pk": 4}), headers={"Authorization": self.bearers["Billy"]})
+        comment_id = json.loads(self.client.get(reverse("issue-comments", kwargs={"pk": 1}), headers={"Authorization": self.bearers["Billy"]}).content)["results"][0]["id"]
+        self.client.delete(reverse("comment-detail", kwargs={"pk": comment_id}), headers={"Authorization": self.bearers["Billy"]})
+        cursor, issues, comments, deleted = self.sync(cursor)
+        # the comment deletion bumped its issue
+        self.assertEqual(issues, ["Renamed", "Issue 0"])
+        self.assertEqual(comments, [])
+        self.assertEqual(deleted, [("issue", 4), ("comment", comment_id)])
+
+    def test_comments_deleted_with_their_issue_get_no_tombstone(self):
+        self.client.delete(reverse("issue-detail", kwargs={"pk": 1}), headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(list(Tombstone.objects.values_list("type", "object_id")), [("issue", "1")])
+
+    def test_moved_issue_leaves_the_old_project_feed(self):
+        cursor, *_ = self.sync()
+        self.client.post(reverse("project-list"), {}, headers={"Authorization": self.bearers["Billy"]})
+        response = self.client.patch(reverse("issue-detail", kwargs={"pk": 1}), {"project": 2}, headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cursor, issues, comments, deleted = self.sync(cursor)
+        self.assertEqual((issues, comments, deleted), ([], [], [("issue", 1)]))
+        _, issues, comments, deleted = self.sync(project=2)
+        self.assertEqual(issues, ["Issue 0"])
+        self.assertEqual(sorted(comments), ["Premier", "Second"])
+
+    def test_moved_comment_leaves_the_old_project_feed(self):
+        cursor, *_ = self.sync()
+        self.client.post(reverse("project-list"), {}, headers={"Authorization": self.bearers["Billy"]})
+        self.client.post(
+            reverse("issue-list"),
+            {"project": 2, "title": "Elsewhere", "assigned_to": 1},
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        comment = Comment.objects.get(description="Premier")
+        response = self.client.patch(reverse("comment-detail", kwargs={"pk": comment.pk}), {"issue": 6}, headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cursor, issues, comments, deleted = self.sync(cursor)
+        self.assertEqual(comments, [])
+        self.assertEqual(deleted, [("comment", str(comment.pk))])
+        _, issues, comments, deleted = self.sync(project=2)
+        self.assertEqual(comments, ["Premier"])
+
+    def test_comment_changes_are_read_through_the_project_index(self):
+        plan = (
+            Comment.objects.filter(project_id=1)
+            .order_by("updated_at", "pk")[:5]
+            .explain()
+        )
+        self.assertIn("comment_project_updated_idx", plan)
+
+    def test_expired_and_invalid_cursors(self):
+        cursor = self.changes()["cursor"]
+        response = self.client.get(reverse("project-changes", kwargs={"pk": 1}), {"cursor": "nope"}, headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        Tombstone.objects.create(project_id=1, type="issue", object_id="9")
+        Tombstone.objects.update(deleted_at=timezone.now() - datetime.timedelta(days=31))
+        call_command("prune_tombstones", stdout=io.StringIO())
+        self.assertFalse(Tombstone.objects.exists())
+        position = json.loads(base64.urlsafe_b64decode(cursor))
+        position["synced_at"] = (timezone.now() - datetime.timedelta(days=31)).isoformat()
+        expired = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+        response = self.client.get(reverse("project-changes", kwargs={"pk": 1}), {"cursor": expired}, headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_only_author_or_contributor_can_read_changes(self):
+        response = self.client.get(reverse("project-changes", kwargs={"pk": 1}), headers={"Authorization": self.bearers["Joe"]})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,4 +1,6 @@
 import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -244,3 +246,92 @@ class CommentsTest(APITestCase):
             )
             self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
             self.assertEqual(Comment.objects.count(), 1)
+
+    def test_comment_access_check_does_not_load_contributors(self):
+        self.client.post(
+            reverse("comment-list"),
+            {
+                "issue": 1,
+                "description": "Lorem ipsum"
+            },
+            headers={"Authorization": self.bearer}
+        )
+        comment_id = Comment.objects.get().id
+        # user state check, comment with its issue, membership existence check
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("comment-detail", kwargs={"pk": comment_id}), headers={"Authorization": self.bearer_contributor})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_listing_issue_comments_checks_membership_once(self):
+        self.client.post(
+            reverse("comment-list"),
+            {
+                "issue": 1,
+                "description": "Lorem ipsum"
+            },
+            headers={"Authorization": self.bearer}
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("issue-comments", kwargs={"pk": 1}), headers={"Authorization": self.bearer_contributor})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        membership_queries = [q for q in queries.captured_queries if "projects_contributor" in q["sql"]]
+        self.assertEqual(len(membership_queries), 1)
+
+    def test_contributor_can_post_comments_in_bulk(self):
+        client_id = "6f1c2b1e-3d4a-4c5b-8e9f-0a1b2c3d4e5f"
+        comments = [{"id": client_id, "description": "CI log 0"}]
+        comments += [{"description": f"CI log {i}"} for i in range(1, 30)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("issue-comments", kwargs={"pk": 1}),
+                comments,
+                format="json",
+                headers={"Authorization": self.bearer_contributor}
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content)[0]["id"], client_id)
+        self.assertEqual(Comment.objects.filter(author=User.objects.get(pk=2)).count(), 30)
+        self.assertLess(len(queries), 15)
+        issue = Comment.objects.select_related("issue__project").first().issue
+        self.assertEqual(issue.comment_count, 30)
+        self.assertEqual(issue.project.comment_count, 30)
+
+    def test_bulk_comments_reject_existing_ids(self):
+        client_id = "6f1c2b1e-3d4a-4c5b-8e9f-0a1b2c3d4e5f"
+        url = reverse("issue-comments", kwargs={"pk": 1})
+        self.client.post(url, [{"id": client_id, "description": "First"}], format="json", headers={"Authorization": self.bearer})
+        response = self.client.post(
+            url,
+            [{"description": "New"}, {"id": client_id, "description": "Retried"}],
+            format="json",
+            headers={"Authorization": self.bearer}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content)[0], {})
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_only_author_or_contributor_can_post_comments_in_bulk(self):
+        response = self.client.post(
+            reverse("issue-comments", kwargs={"pk": 1}),
+            [{"description": "Unauthorized comment"}],
+            format="json",
+            headers={"Authorization": self.bearer_outsider}
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Comment.objects.count(), 0)
+
+    def test_issue_comments_query_count_is_constant(self):
+        self.client.post(
+            reverse("issue-comments", kwargs={"pk": 1}),
+            [{"description": f"Comment {i}"} for i in range(25)],
+            format="json",
+            headers={"Authorization": self.bearer}
+        )
+        url = reverse("issue-comments", kwargs={"pk": 1})
+        # caches the user's state
+        self.client.get(url, headers={"Authorization": self.bearer_contributor})
+        for page_size in [1, 25]:
+            # issue, membership, collection validators, page
+            with self.assertNumQueries(4):
+                response = self.client.get(url, {"page_size": page_size}, headers={"Authorization": self.bearer_contributor})
+            self.assertEqual(len(json.loads(response.content)["results"]), page_size)
@@ -0,0 +1,83 @@
+import json
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        url = reverse("user-list")
+        for username in ["Billy", "Joe"]:
+            self.client.post(url, {
+                "username": username,
+                "password": "password123",
+                "birth_date": "2000-01-01",
+            }, format="json")
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "Billy", "password": "password123"},
+            format="json",
+        )
+        self.bearer = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(reverse("project-list"), {}, headers={"Authorization": self.bearer})
+        self.client.post(
+            "http://testserver/projects/1/add_contributors/",
+            { "contributor_ids": [2] },
+            headers={"Authorization": self.bearer}
+        )
+        self.create_issue("Issue 1")
+        return super().setUp()
+
+    def create_issue(self, title):
+        self.client.post(
+            reverse("issue-list"),
+            {
+                "project": 1,
+                "title": title,
+                "assigned_to": 2,
+            },
+            headers={"Authorization": self.bearer}
+        )
+
+    def test_detail_returns_304_until_object_changes(self):
+        url = reverse("issue-detail", kwargs={"pk": 1})
+        response = self.client.get(url, headers={"Authorization": self.bearer})
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+        for _ in range(2):
+            response = self.client.get(url, headers={"Authorization": self.bearer, "If-None-Match": etag})
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response.content, b"")
+        self.client.patch(url, {"status": "finished"}, headers={"Authorization": self.bearer})
+        response = self.client.get(url, headers={"Authorization": self.bearer, "If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_collection_returns_304_until_collection_changes(self):
+        url = reverse("project-issues", kwargs={"pk": 1})
+        etag = self.client.get(url, headers={"Authorization": self.bearer})["ETag"]
+        response = self.client.get(url, headers={"Authorization": self.bearer, "If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.create_issue("Issue 2")
+        response = self.client.get(url, headers={"Authorization": self.bearer, "If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(json.loads(response.content)["results"]), 2)
+
+    def test_etag_depends_on_page(self):
+        url = reverse("project-issues", kwargs={"pk": 1})
+        etag = self.client.get(url, headers={"Authorization": self.bearer})["ETag"]
+        response = self.client.get(url, {"limit": 1}, headers={"Authorization": self.bearer, "If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unauthorized_user_gets_403_not_304(self):
+        url = reverse("issue-detail", kwargs={"pk": 1})
+        etag = self.client.get(url, headers={"Authorization": self.bearer})["ETag"]
+        self.client.post(reverse("user-list"), {"username": "Jimbob", "birth_date": "2000-01-01", "password": "password123"}, format="json")
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "Jimbob", "password": "password123"},
+            format="json",
+        )
+        bearer = f"Bearer {json.loads(response.content)["access"]}"
+        response = self.client.get(url, headers={"Authorization": bearer, "If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,112 @@
+import io
+import json
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from projects.models import Project, Issue
+
+
+class CountersTest(APITestCase):
+    def setUp(self):
+        url = reverse("user-list")
+        for username in ["Billy", "Joe"]:
+            self.client.post(url, {
+                "username": username,
+                "password": "password123",
+                "birth_date": "2000-01-01",
+            }, format="json")
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "Billy", "password": "password123"},
+            format="json",
+        )
+        self.bearer = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(reverse("project-list"), {}, headers={"Authorization": self.bearer})
+        self.client.post(
+            "http://testserver/projects/1/add_contributors/",
+            { "contributor_ids": [2] },
+            headers={"Authorization": self.bearer}
+        )
+        for status in ["to-do", "to-do", "in-progress"]:
+            self.client.post(
+                reverse("issue-list"),
+                {
+                    "project": 1,
+                    "title": "Issue",
+                    "assigned_to": 2,
+                    "status": status,
+                },
+                headers={"Authorization": self.bearer}
+            )
+        for issue in [1, 1, 2]:
+            self.client.post(
+                reverse("comment-list"),
+                {"issue": issue, "description": "Lorem ipsum"},
+                headers={"Authorization": self.bearer}
+            )
+        return super().setUp()
+
+    def counters(self):
+        project = Project.objects.get()
+        return {
+            "to-do": project.todo_issue_count,
+            "in-progress": project.in_progress_issue_count,
+            "finished": project.finished_issue_count,
+            "comments": project.comment_count,
+            "contributors": project.contributor_count,
+            "issue_comments": list(Issue.objects.order_by("pk").values_list("comment_count", flat=True)),
+        }
+
+    def test_contributor_changes_respond_with_current_count(self):
+        # the author counts as a contributor
+        for action, count in [("remove_contributors", 1), ("add_contributors", 2)]:
+            response = self.client.post(
+                f"http://testserver/projects/1/{action}/",
+                {"contributor_ids": [2]},
+                headers={"Authorization": self.bearer}
+            )
+            self.assertEqual(json.loads(response.content)["contributor_count"], count)
+
+    def test_counters_follow_creations(self):
+        self.assertEqual(self.counters(), {
+            "to-do": 2,
+            "in-progress": 1,
+            "finished": 0,
+            "comments": 3,
+            "contributors": 2,
+            "issue_comments": [2, 1, 0],
+        })
+
+    def test_counters_follow_status_changes_and_deletions(self):
+        self.client.patch(
+            reverse("issue-detail", kwargs={"pk": 2}),
+            {"status": "finished"},
+            headers={"Authorization": self.bearer}
+        )
+        self.client.delete(reverse("issue-detail", kwargs={"pk": 1}), headers={"Authorization": self.bearer})
+        self.client.post(
+            "http://testserver/projects/1/remove_contributors/",
+            { "contributor_ids": [2] },
+            headers={"Authorization": self.bearer}
+        )
+        self.assertEqual(self.counters(), {
+            "to-do": 0,
+            "in-progress": 1,
+            "finished": 1,
+            "comments": 1,
+            "contributors": 1,
+            "issue_comments": [1, 0],
+        })
+
+    def test_counters_exposed_in_project_list_and_detail(self):
+        response = self.client.get(reverse("project-list"), headers={"Authorization": self.bearer})
+        self.assertEqual(json.loads(response.content)["results"][0]["todo_issue_count"], 2)
+        response = self.client.get(reverse("project-detail", kwargs={"pk": 1}), headers={"Authorization": self.bearer})
+        self.assertEqual(json.loads(response.content)["comment_count"], 3)
+
+    def test_recompute_counters_command(self):
+        expected = self.counters()
+        Project.objects.update(todo_issue_count=0, comment_count=0, contributor_count=0)
+        Issue.objects.update(comment_count=0)
+        call_command("recompute_counters", stdout=io.StringIO())
+        self.assertEqual(self.counters(), expected)
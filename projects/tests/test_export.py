@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+
+class ProjectExportTest(APITestCase):
+    def setUp(self):
+        url = reverse("user-list")
+        for username in ["Billy", "Joe"]:
+            self.client.post(url, {
+                "username": username,
+                "password": "password123",
+                "birth_date": "2000-01-01",
+            }, format="json")
+        url = reverse("token_obtain_pair")
+        self.bearers = {}
+        for username in ["Billy", "Joe"]:
+            response = self.client.post(
+                url,
+                {"username": username, "password": "password123"},
+                format="json",
+            )
+            self.bearers[username] = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(reverse("project-list"), {"title": "Exported"}, headers={"Authorization": self.bearers["Billy"]})
+        for title in ["Issue 1", "Issue 2"]:
+            self.client.post(
+                reverse("issue-list"),
+                {"project": 1, "title": title, "assigned_to": 1},
+                headers={"Authorization": self.bearers["Billy"]}
+            )
+        self.client.post(
+            reverse("comment-list"),
+            {"issue": 2, "description": "Première remarque"},
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        return super().setUp()
+
+    def export(self, username, **params):
+        return self.client.get(
+            reverse("project-export", kwargs={"pk": 1}),
+            params,
+            headers={"Authorization": self.bearers[username]}
+        )
+
+    def test_export_ndjson(self):
+        response = self.export("Billy")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(
+            [(row["type"], row["id"]) for row in rows],
+            [("project", 1), ("issue", 1), ("issue", 2), ("comment", rows[3]["id"])],
+        )
+        self.assertEqual(rows[0]["title"], "Exported")
+        self.assertEqual(rows[3]["issue_id"], 2)
+        self.assertEqual(rows[3]["description"], "Première remarque")
+
+    def test_export_csv(self):
+        response = self.export("Billy", type="csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("project-1.csv", response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row["type"] for row in rows], ["project", "issue", "issue", "comment"])
+        self.assertEqual(rows[2]["title"], "Issue 2")
+
+    def test_unknown_format_returns_400(self):
+        response = self.export("Billy", type="xml")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_only_author_or_contributor_can_export(self):
+        response = self.export("Joe")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,9 +1,12 @@
 import time
 import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from projects.models import Issue
+from projects.models import Project, Issue
+from projects.filters import filter_issues
 from users.models import User
 
 
@@ -254,3 +257,294 @@ class IssuesTest(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertEqual(Issue.objects.count(), 1)
+
+    def test_project_issues_cursor_pagination_walks_every_issue(self):
+        for i in range(7):
+            self.client.post(
+                reverse("issue-list"),
+                {
+                    "project": 1,
+                    "title": f"Issue {i}",
+                    "assigned_to": 2,
+                },
+                headers={"Authorization": self.bearer}
+            )
+        # give two issues the same creation date to exercise the id tie-breaker
+        Issue.objects.filter(pk__in=[3, 4]).update(created_at=Issue.objects.get(pk=3).created_at)
+        url = reverse("project-issues", kwargs={"pk": 1})
+        titles = []
+        while url:
+            response = self.client.get(url, headers={"Authorization": self.bearer})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            content = json.loads(response.content)
+            self.assertNotIn("count", content)
+            titles += [issue["title"] for issue in content["results"]]
+            url = content["next"]
+        self.assertEqual(titles, [f"Issue {i}" for i in range(7)])
+
+    def test_project_issues_limit_offset_pagination_still_available(self):
+        for i in range(7):
+            self.client.post(
+                reverse("issue-list"),
+                {
+                    "project": 1,
+                    "title": f"Issue {i}",
+                    "assigned_to": 2,
+                },
+                headers={"Authorization": self.bearer}
+            )
+        response = self.client.get(reverse("project-issues", kwargs={"pk": 1}), {"limit": 5, "offset": 5}, headers={"Authorization": self.bearer})
+        content = json.loads(response.content)
+        self.assertEqual(content["count"], 7)
+        self.assertEqual([issue["title"] for issue in content["results"]], ["Issue 5", "Issue 6"])
+
+    def test_project_issues_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("project-issues", kwargs={"pk": 1}), {"cursor": "nope"}, headers={"Authorization": self.bearer})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_create_update_and_delete_issues(self):
+        for i in range(2):
+            self.client.post(
+                reverse("issue-list"),
+                {"project": 1, "title": f"Issue {i}", "assigned_to": 2},
+                headers={"Authorization": self.bearer}
+            )
+        response = self.client.post(
+            reverse("issue-bulk"),
+            {
+                "project": 1,
+                "create": [
+                    {"title": f"Imported {i}", "assigned_to": 2, "status": "finished"}
+                    for i in range(20)
+                ],
+                "update": [{"id": 1, "status": "in-progress"}],
+                "delete": [2],
+            },
+            format="json",
+            headers={"Authorization": self.bearer}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = json.loads(response.content)
+        self.assertEqual(len(content["create"]), 20)
+        self.assertEqual(content["create"][0]["author"], 1)
+        self.assertEqual(content["create"][0]["assigned_to"], 2)
+        self.assertEqual(content["update"][0]["status"], "in-progress")
+        self.assertEqual(content["delete"], [2])
+        self.assertEqual(Issue.objects.filter(status="finished").count(), 20)
+        self.assertFalse(Issue.objects.filter(pk=2).exists())
+        project = Project.objects.get()
+        self.assertEqual(
+            (project.todo_issue_count, project.in_progress_issue_count, project.finished_issue_count),
+            (0, 1, 20),
+        )
+
+    def test_bulk_create_query_count_does_not_grow_with_batch(self):
+        def create(count):
+            return self.client.post(
+                reverse("issue-bulk"),
+                {
+                    "project": 1,
+                    "create": [{"title": "Imported", "assigned_to": 2}] * count,
+                },
+                format="json",
+                headers={"Authorization": self.bearer}
+            )
+        with CaptureQueriesContext(connection) as single:
+            create(1)
+        with CaptureQueriesContext(connection) as many:
+            create(50)
+        self.assertEqual(len(single), len(many))
+        self.assertEqual(Issue.objects.count(), 51)
+
+    def test_bulk_reports_errors_per_item_and_writes_nothing(self):
+        self.client.post(reverse("user-list"), {"username": "Jimbob", "birth_date": "2000-01-01", "password": "password123"}, format="json")
+        response = self.client.post(
+            reverse("issue-bulk"),
+            {
+                "project": 1,
+                "create": [
+                    {"title": "Valid", "assigned_to": 2},
+                    {"title": "Outsider", "assigned_to": 3},
+                ],
+                "delete": [42],
+            },
+            format="json",
+            headers={"Authorization": self.bearer}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        content = json.loads(response.content)
+        self.assertEqual(content["create"][0], {})
+        self.assertIn("assigned_to", content["create"][1])
+        self.assertIn("id", content["delete"][0])
+        self.assertEqual(Issue.objects.count(), 0)
+
+    def test_bulk_update_rejects_non_integer_ids(self):
+        self.create_issues({"title": "Issue 1", "assigned_to": 2})
+        response = self.client.post(
+            reverse("issue-bulk"),
+            {
+                "project": 1,
+                "update": [
+                    {"id": [1], "title": "List"},
+                    {"id": {}, "title": "Dict"},
+                    {"id": True, "title": "Bool"},
+                    {"title": "Missing"},
+                ],
+            },
+            format="json",
+            headers={"Authorization": self.bearer}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        content = json.loads(response.content)
+        self.assertEqual(len(content["update"]), 4)
+        for error in content["update"]:
+            self.assertIn("id", error)
+        self.assertEqual(Issue.objects.get().title, "Issue 1")
+
+    def test_only_author_or_contributor_can_bulk_create(self):
+        self.client.post(reverse("user-list"), {"username": "Jimbob", "birth_date": "2000-01-01", "password": "password123"}, format="json")
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "Jimbob", "password": "password123"},
+            format="json",
+        )
+        bearer = f"Bearer {json.loads(response.content)["access"]}"
+        response = self.client.post(
+            reverse("issue-bulk"),
+            {"project": 1, "create": [{"title": "Issue", "assigned_to": 2}]},
+            format="json",
+            headers={"Authorization": bearer}
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Issue.objects.count(), 0)
+
+    def test_project_issues_query_count_is_constant(self):
+        self.client.post(
+            reverse("issue-bulk"),
+            {"project": 1, "create": [{"title": "Issue", "assigned_to": 2}] * 25},
+            format="json",
+            headers={"Authorization": self.bearer}
+        )
+        url = reverse("project-issues", kwargs={"pk": 1})
+        for page_size in [1, 25]:
+            # project, collection validators, page (the author needs no
+            # membership lookup)
+            with self.assertNumQueries(3):
+                response = self.client.get(url, {"page_size": page_size}, headers={"Authorization": self.bearer})
+            self.assertEqual(len(json.loads(response.content)["results"]), page_size)
+
+    def test_project_issues_sparse_fieldset_narrows_query(self):
+        self.client.post(
+            reverse("issue-list"),
+            {"project": 1, "title": "Issue 1", "description": "Long text", "assigned_to": 2},
+            headers={"Authorization": self.bearer}
+        )
+        url = reverse("project-issues", kwargs={"pk": 1})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"fields": "id,title,status"}, headers={"Authorization": self.bearer})
+        self.assertEqual(json.loads(response.content)["results"], [{"id": 1, "title": "Issue 1", "status": "to-do"}])
+        self.assertNotIn('"description"', queries.captured_queries[-1]["sql"])
+        response = self.client.get(url, {"omit": "description"}, headers={"Authorization": self.bearer})
+        issue = json.loads(response.content)["results"][0]
+        self.assertNotIn("description", issue)
+        self.assertEqual(issue["assigned_to"], 2)
+
+    def create_issues(self, *issues):
+        self.client.post(
+            reverse("issue-bulk"),
+            {"project": 1, "create": list(issues)},
+            format="json",
+            headers={"Authorization": self.bearer}
+        )
+
+    def test_project_issues_filters(self):
+        self.create_issues(
+            {"title": "Open high bug", "assigned_to": 2, "priority": "high", "tag": "bug"},
+            {"title": "Open low bug", "assigned_to": 2, "priority": "low", "tag": "bug"},
+            {"title": "Done high bug", "assigned_to": 2, "priority": "high", "status": "finished"},
+            {"title": "Mine high task", "assigned_to": 1, "priority": "high", "tag": "task"},
+        )
+        url = reverse("project-issues", kwargs={"pk": 1})
+
+        def titles(**params):
+            response = self.client.get(url, {"page_size": 10, **params}, headers={"Authorization": self.bearer})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [issue["title"] for issue in json.loads(response.content)["results"]]
+
+        self.assertEqual(titles(status="to-do", priority="high", tag="bug", assigned_to=2), ["Open high bug"])
+        self.assertEqual(titles(status="to-do,finished", priority="high", assigned_to=2), ["Open high bug", "Done high bug"])
+        self.assertEqual(titles(author=1, tag="task"), ["Mine high task"])
+        Issue.objects.filter(title="Open low bug").update(created_at="2020-01-01T00:00:00Z")
+        self.assertEqual(titles(created_before="2021-01-01"), ["Open low bug"])
+        self.assertEqual(len(titles(created_after="2021-01-01T00:00")), 3)
+
+    def test_project_issues_ordering_with_cursor(self):
+        self.create_issues(*({"title": f"Issue {i}", "assigned_to": 2} for i in range(4)))
+        Issue.objects.filter(title="Issue 1").update(updated_at="2030-01-01T00:00:00Z")
+        url = reverse("project-issues", kwargs={"pk": 1})
+        response = self.client.get(url, {"ordering": "-updated_at", "page_size": 2}, headers={"Authorization": self.bearer})
+        content = json.loads(response.content)
+        titles = [issue["title"] for issue in content["results"]]
+        response = self.client.get(content["next"], headers={"Authorization": self.bearer})
+        titles += [issue["title"] for issue in json.loads(response.content)["results"]]
+        self.assertEqual(titles, ["Issue 1", "Issue 3", "Issue 2", "Issue 0"])
+
+    def test_project_issues_invalid_filters_return_400(self):
+        url = reverse("project-issues", kwargs={"pk": 1})
+        for params in [{"status": "open"}, {"assigned_to": "me"}, {"created_after": "yesterday"}, {"ordering": "title"}]:
+            response = self.client.get(url, params, headers={"Authorization": self.bearer})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(list(params)[0], json.loads(response.content))
+
+    def test_project_issues_filters_use_indexes(self):
+        plan = (
+            filter_issues(Issue.objects.filter(project_id=1), {"status": "to-do", "priority": "high"})
+            .order_by("created_at", "id")[:5]
+            .explain()
+        )
+        self.assertIn("issue_project_status_idx", plan)
+        plan = Issue.objects.filter(project_id=1).order_by("-updated_at", "-id")[:5].explain()
+        self.assertIn("issue_project_updated_idx", plan)
+
+    def test_mine_lists_assigned_and_authored_issues_across_projects(self):
+        response = self.client.post(reverse("token_obtain_pair"), {"username": "Joe", "password": "password123"}, format="json")
+        bearer_joe = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(reverse("project-list"), {"title": "Joe's"}, headers={"Authorization": bearer_joe})
+        self.create_issues(
+            {"title": "For Joe", "assigned_to": 2, "status": "in-progress"},
+            {"title": "For Billy", "assigned_to": 1},
+        )
+        self.client.post(
+            reverse("issue-bulk"),
+            {"project": 2, "create": [{"title": "Joe's own", "assigned_to": 2}]},
+            format="json",
+            headers={"Authorization": bearer_joe}
+        )
+        url = reverse("issue-mine")
+
+        def titles(bearer, **params):
+            response = self.client.get(url, params, headers={"Authorization": bearer})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [issue["title"] for issue in json.loads(response.content)["results"]]
+
+        self.assertEqual(titles(bearer_joe), ["Joe's own", "For Joe"])
+        self.assertEqual(titles(bearer_joe, status="in-progress"), ["For Joe"])
+        self.assertEqual(titles(self.bearer, role="authored"), ["For Billy", "For Joe"])
+        self.assertEqual(titles(self.bearer, role="assigned"), ["For Billy"])
+        # assigned issues of projects the user left are no longer visible
+        self.client.post("http://testserver/projects/1/remove_contributors/", {"contributor_ids": [2]}, headers={"Authorization": self.bearer})
+        self.assertEqual(titles(bearer_joe), ["Joe's own"])
+
+    def test_mine_is_cursor_paginated_by_last_update(self):
+        self.create_issues(*({"title": f"Issue {i}", "assigned_to": 1} for i in range(3)))
+        Issue.objects.filter(title="Issue 0").update(updated_at="2030-01-01T00:00:00Z")
+        response = self.client.get(reverse("issue-mine"), {"page_size": 2}, headers={"Authorization": self.bearer})
+        content = json.loads(response.content)
+        titles = [issue["title"] for issue in content["results"]]
+        response = self.client.get(content["next"], headers={"Authorization": self.bearer})
+        titles += [issue["title"] for issue in json.loads(response.content)["results"]]
+        self.assertEqual(titles, ["Issue 0", "Issue 2", "Issue 1"])
+
+    def test_mine_assigned_feed_uses_index(self):
+        plan = Issue.objects.filter(assigned_to_id=2, status="to-do").order_by("-updated_at")[:5].explain()
+        self.assertIn("issue_assignee_updated_idx", plan)
@@ -1,5 +1,7 @@
 import time
 import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -180,3 +182,43 @@ class ProjectsTest(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertIn(User.objects.get(pk=2), Project.objects.get().contributors.all())
+
+    def test_create_project_with_contributors(self):
+        for username in ["Joe", "Jimbob"]:
+            self.client.post(reverse("user-list"), {"username": username, "birth_date": "2000-01-01", "password": "password123"}, format="json")
+        response = self.client.post(self.list_url, {"contributors": [2, 3]}, format="json", headers={"Authorization": self.bearer})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted(Project.objects.get().contributors.values_list("pk", flat=True)),
+            [1, 2, 3]
+        )
+
+    def test_create_project_with_unknown_contributors_returns_400(self):
+        self.client.post(reverse("user-list"), {"username": "Joe", "birth_date": "2000-01-01", "password": "password123"}, format="json")
+        response = self.client.post(self.list_url, {"contributors": [2, 41, 42]}, format="json", headers={"Authorization": self.bearer})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(json.loads(response.content)["contributors"]), 2)
+        self.assertEqual(Project.objects.count(), 0)
+
+    def test_list_only_returns_authored_or_contributed_projects(self):
+        self.client.post(reverse("user-list"), {"username": "Joe", "birth_date": "2000-01-01", "password": "password123"}, format="json")
+        response = self.client.post(reverse("token_obtain_pair"), {"username": "Joe", "password": "password123"}, format="json")
+        bearer = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(self.list_url, {"title": "Billy's"}, headers={"Authorization": self.bearer})
+        self.client.post(self.list_url, {"title": "Joe's"}, headers={"Authorization": bearer})
+        self.client.post(self.list_url, {"title": "Shared"}, headers={"Authorization": bearer})
+        self.client.post("http://testserver/projects/3/add_contributors/", {"contributor_ids": [1]}, headers={"Authorization": bearer})
+        response = self.client.get(self.list_url, headers={"Authorization": self.bearer})
+        titles = [project["title"] for project in json.loads(response.content)["results"]]
+        self.assertEqual(titles, ["Billy's", "Shared"])
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        for i in range(12):
+            self.client.post(self.list_url, {"title": f"Project {i}"}, headers={"Authorization": self.bearer})
+        with CaptureQueriesContext(connection) as small_page:
+            response = self.client.get(self.list_url, {"page_size": 2}, headers={"Authorization": self.bearer})
+        self.assertEqual(len(json.loads(response.content)["results"]), 2)
+        with CaptureQueriesContext(connection) as large_page:
+            response = self.client.get(self.list_url, {"page_size": 12}, headers={"Authorization": self.bearer})
+        self.assertEqual(len(json.loads(response.content)["results"]), 12)
+        self.assertEqual(len(small_page), len(large_page))
@@ -0,0 +1,44 @@
+import datetime
+import decimal
+import io
+import uuid
+from unittest import mock
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from softdesk import renderers
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    payload = {
+        "id": uuid.UUID("6f1c2b1e-3d4a-4c5b-8e9f-0a1b2c3d4e5f"),
+        "created_at": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        "birth_date": datetime.date(2000, 1, 1),
+        "estimate": decimal.Decimal("1.50"),
+        "title": "Épopée \u2028\u2029 \"quoted\" \\ 🐛",
+        "results": [{"count": 3, "done": False, "assignee": None}],
+        1: "non string key",
+    }
+
+    def test_same_output_as_json_renderer(self):
+        expected = JSONRenderer().render(self.payload)
+        self.assertEqual(renderers.FastJSONRenderer().render(self.payload), expected)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(renderers.FastJSONRenderer().render(self.payload), expected)
+
+    def test_indented_output_left_to_json_renderer(self):
+        expected = JSONRenderer().render(self.payload, "application/json; indent=4")
+        self.assertEqual(
+            renderers.FastJSONRenderer().render(self.payload, "application/json; indent=4"),
+            expected,
+        )
+
+    def test_parser_matches_json_parser(self):
+        body = '{"title": "Épopée", "ids": [1, 2], "done": true, "assignee": null}'.encode()
+        self.assertEqual(
+            renderers.FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+        with self.assertRaises(ParseError):
+            renderers.FastJSONParser().parse(io.BytesIO(b"{nope"))
@@ -0,0 +1,83 @@
+import json
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from projects.models import Project, Issue, Comment
+from projects.serializer import (
+    ProjectListSerializer,
+    IssueSerializer,
+    CommentSerializer,
+)
+from softdesk.serializers import represent_row
+
+
+class ValuesRepresentationTest(APITestCase):
+    def setUp(self):
+        url = reverse("user-list")
+        for username in ["Billy", "Joe"]:
+            self.client.post(url, {
+                "username": username,
+                "password": "password123",
+                "birth_date": "2000-01-01",
+            }, format="json")
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "Billy", "password": "password123"},
+            format="json",
+        )
+        self.bearer = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(reverse("project-list"), {"title": "Projet àé", "contributors": [2]}, headers={"Authorization": self.bearer})
+        self.client.post(
+            reverse("issue-bulk"),
+            {
+                "project": 1,
+                "create": [
+                    {"title": "Issue 1", "assigned_to": 2, "status": "in-progress", "priority": "high"},
+                    {"title": "Issue 2", "description": "Ligne 1\nLigne \"2\"", "assigned_to": 1, "tag": "task"},
+                ],
+            },
+            format="json",
+            headers={"Authorization": self.bearer}
+        )
+        self.client.post(
+            reverse("issue-comments", kwargs={"pk": 1}),
+            [{"description": "Premier"}, {"description": ""}],
+            format="json",
+            headers={"Authorization": self.bearer}
+        )
+        return super().setUp()
+
+    def render_both(self, serializer_class, queryset, query=None):
+        request = Request(APIRequestFactory().get("/", query or {}))
+        regular = serializer_class(
+            queryset, many=True, context={"request": request}
+        ).data
+        plan = serializer_class.get_values_plan(request)
+        rows = queryset.values(*{column for _, column, _ in plan})
+        fast = [represent_row(plan, row) for row in rows]
+        renderer = JSONRenderer()
+        return renderer.render(regular), renderer.render(fast)
+
+    def test_values_representation_matches_serializers(self):
+        cases = [
+            (ProjectListSerializer, Project.objects.order_by("id")),
+            (IssueSerializer, Issue.objects.order_by("id")),
+            (CommentSerializer, Comment.objects.order_by("created_at", "id")),
+        ]
+        for serializer_class, queryset in cases:
+            with self.subTest(serializer=serializer_class.__name__):
+                regular, fast = self.render_both(serializer_class, queryset)
+                self.assertEqual(regular, fast)
+
+    def test_values_representation_matches_sparse_fieldsets(self):
+        regular, fast = self.render_both(
+            IssueSerializer, Issue.objects.order_by("id"), {"fields": "id,status,created_at"}
+        )
+        self.assertEqual(regular, fast)
+        self.assertEqual(set(json.loads(fast)[0]), {"id", "status", "created_at"})
+
+    def test_list_endpoint_uses_values_representation(self):
+        response = self.client.get(reverse("project-issues", kwargs={"pk": 1}), headers={"Authorization": self.bearer})
+        regular, _ = self.render_both(IssueSerializer, Issue.objects.order_by("created_at", "id"))
+        self.assertEqual(json.loads(response.content)["results"], json.loads(regular))
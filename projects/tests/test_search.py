@@ -0,0 +1,88 @@
+import io
+import json
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from projects.models import Issue
+
+
+class SearchTest(APITestCase):
+    def setUp(self):
+        url = reverse("user-list")
+        for username in ["Billy", "Joe", "Jimbob"]:
+            self.client.post(url, {
+                "username": username,
+                "password": "password123",
+                "birth_date": "2000-01-01",
+            }, format="json")
+        url = reverse("token_obtain_pair")
+        self.bearers = {}
+        for username in ["Billy", "Joe", "Jimbob"]:
+            response = self.client.post(
+                url,
+                {"username": username, "password": "password123"},
+                format="json",
+            )
+            self.bearers[username] = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(reverse("project-list"), {"contributors": [2]}, headers={"Authorization": self.bearers["Billy"]})
+        self.client.post(reverse("project-list"), {}, headers={"Authorization": self.bearers["Jimbob"]})
+        self.client.post(
+            reverse("issue-bulk"),
+            {
+                "project": 1,
+                "create": [
+                    {"title": "Crash au démarrage", "description": "L'application plante", "assigned_to": 2},
+                    {"title": "Écran de connexion", "description": "Le bouton provoque un crash", "assigned_to": 2},
+                ],
+            },
+            format="json",
+            headers={"Authorization": self.bearers["Billy"]}
+        )
+        self.client.post(
+            reverse("issue-bulk"),
+            {"project": 2, "create": [{"title": "Crash privé", "assigned_to": 3}]},
+            format="json",
+            headers={"Authorization": self.bearers["Jimbob"]}
+        )
+        self.client.post(
+            reverse("issue-comments", kwargs={"pk": 2}),
+            [{"description": "Reproduit le crash sur Android"}],
+            format="json",
+            headers={"Authorization": self.bearers["Joe"]}
+        )
+        return super().setUp()
+
+    def search(self, username, **params):
+        response = self.client.get(reverse("issue-search"), params, headers={"Authorization": self.bearers[username]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_search_ranks_title_matches_first_within_user_projects(self):
+        results = self.search("Joe", q="crash")
+        self.assertEqual([issue["id"] for issue in results["issues"]], [1, 2])
+        self.assertEqual([comment["issue"] for comment in results["comments"]], [2])
+        results = self.search("Jimbob", q="crash")
+        self.assertEqual([issue["id"] for issue in results["issues"]], [3])
+        self.assertEqual(results["comments"], [])
+
+    def test_search_ignores_accents_and_matches_prefixes(self):
+        results = self.search("Billy", q="ecran conn")
+        self.assertEqual([issue["id"] for issue in results["issues"]], [2])
+        results = self.search("Billy", q='"demarr* (')
+        self.assertEqual([issue["id"] for issue in results["issues"]], [1])
+
+    def test_search_index_follows_updates_and_deletions(self):
+        self.client.patch(reverse("issue-detail", kwargs={"pk": 1}), {"title": "Lenteur"}, headers={"Authorization": self.bearers["Billy"]})
+        Issue.objects.filter(pk=2).update(description="Rien à signaler")
+        self.assertEqual(self.search("Billy", q="crash")["issues"], [])
+        self.assertEqual([issue["id"] for issue in self.search("Billy", q="lenteur")["issues"]], [1])
+        self.client.delete(reverse("issue-detail", kwargs={"pk": 2}), headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(self.search("Billy", q="android")["comments"], [])
+        call_command("rebuild_search_index", stdout=io.StringIO())
+        self.assertEqual([issue["id"] for issue in self.search("Billy", q="lenteur")["issues"]], [1])
+
+    def test_search_filters_by_project_and_requires_query(self):
+        self.assertEqual(self.search("Billy", q="crash", project=2)["issues"], [])
+        response = self.client.get(reverse("issue-search"), headers={"Authorization": self.bearers["Billy"]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,33 @@
+import os
+import tempfile
+from django.db import connection, connections
+from django.test import SimpleTestCase
+
+
+class SQLitePragmasTest(SimpleTestCase):
+    databases = ["default"]
+
+    def pragma(self, wrapper, name):
+        return wrapper.connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        wrapper = connections["default"].__class__(
+            {
+                **connection.settings_dict,
+                "NAME": os.path.join(directory.name, "db.sqlite3"),
+            }
+        )
+        # cleanups run last in first out: closed before the directory goes
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        # NORMAL
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)
+        self.assertEqual(self.pragma(wrapper, "cache_size"), -20000)
+        self.assertEqual(self.pragma(wrapper, "mmap_size"), 256 * 2**20)
+
+    def test_test_database_connection_is_tuned(self):
+        connection.ensure_connection()
+        self.assertEqual(self.pragma(connection, "cache_size"), -20000)
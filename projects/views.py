@@ -1,38 +1,90 @@
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework import permissions
+from rest_framework import serializers
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from projects.models import Project, Issue, Comment
+from projects.models import Project, Contributor, Issue, Comment
 from users.models import User
+from softdesk.pagination import DefaultPagination
 from projects.serializer import (
     ProjectSerializer,
     ProjectListSerializer,
     CommentSerializer,
     ContributorSerializer,
     IssueSerializer,
+    IssueBatchSerializer,
 )
 from projects.permissions import (
     ProjectPermission,
     IssuePermission,
     CommentPermission,
 )
+from projects.membership import can_view, is_author_or_member, project_scope
+from projects.counters import refresh_contributor_count
+from projects.caching import CachedRetrieveMixin
+from projects.conditional import ConditionalListMixin
+from projects.export import EXPORT_FORMATS
+from projects.bulk import IssueBatch, create_comments
+from projects.search import SEARCH_LIMIT, get_backend
+from projects.filters import filter_issues, issue_ordering, user_issues
+from projects import changes
 
 
-class ProjectViewSet(ModelViewSet):
+class ProjectViewSet(ConditionalListMixin, CachedRetrieveMixin, ModelViewSet):
     queryset = Project.objects.all()
     permission_classes = [permissions.IsAuthenticated, ProjectPermission]
 
+    def get_access_ids(self, instance):
+        return instance.author_id, instance.pk
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if self.action == "list" and not user.is_superuser:
+            return queryset.filter(project_scope(user))
+        return queryset
+
+    def get_contributor_ids(self):
+        data = self.request.data
+        contributors = (
+            data.getlist("contributors")
+            if hasattr(data, "getlist")
+            else data.get("contributors", [])
+        )
+        try:
+            return {int(c) for c in contributors}
+        except (TypeError, ValueError):
+            raise serializers.ValidationError(
+                {"contributors": "Identifiants d'utilisateurs invalides"}
+            )
+
+    @transaction.atomic
     def perform_create(self, serializer):
+        contributor_ids = self.get_contributor_ids()
+        # validate every submitted id with a single query
+        known_ids = set(
+            User.objects.filter(pk__in=contributor_ids).values_list(
+                "pk", flat=True
+            )
+        )
+        unknown_ids = sorted(contributor_ids - known_ids)
+        if unknown_ids:
+            raise serializers.ValidationError(
+                {
+                    "contributors": [
+                        f"Utilisateur inconnu : {pk}" for pk in unknown_ids
+                    ]
+                }
+            )
         project = serializer.save(author=self.request.user)
-        contributors = self.request.data.get("contributors", [])
-        [
-            project.contributors.add(c)
-            for c in contributors
-            if User.objects.get(pk=c)
-        ]
-        project.contributors.add(self.request.user)
+        known_ids.add(self.request.user.pk)
+        Contributor.objects.bulk_create(
+            [Contributor(user_id=pk, project=project) for pk in known_ids]
+        )
+        refresh_contributor_count([project.pk])
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -46,13 +98,16 @@ class ProjectViewSet(ModelViewSet):
     )
     def add_contributors(self, request, pk=None):
         project = self.get_object()
-        if project.author == request.user or request.user.is_superuser:
+        if project.author_id == request.user.pk or request.user.is_superuser:
             serializer = ContributorSerializer(data=request.data)
             if serializer.is_valid():
                 project.contributors.add(
                     *serializer.validated_data["contributor_ids"]  # type: ignore
                 )
-                project.save()
+                # written by the m2m_changed receiver, see counters
+                project.refresh_from_db(
+                    fields=["contributor_count", "updated_at"]
+                )
                 return Response(
                     ProjectSerializer(
                         instance=project, context={"request": request}
@@ -75,13 +130,16 @@ class ProjectViewSet(ModelViewSet):
     )
     def remove_contributors(self, request, pk=None):
         project = self.get_object()
-        if project.author == request.user or request.user.is_superuser:
+        if project.author_id == request.user.pk or request.user.is_superuser:
             serializer = ContributorSerializer(data=request.data)
             if serializer.is_valid():
                 project.contributors.remove(
                     *serializer.validated_data["contributor_ids"]  # type: ignore
                 )
-                project.save()
+                # written by the m2m_changed receiver, see counters
+                project.refresh_from_db(
+                    fields=["contributor_count", "updated_at"]
+                )
                 return Response(
                     ProjectSerializer(
                         instance=project, context={"request": request}
@@ -101,68 +159,224 @@ class ProjectViewSet(ModelViewSet):
         detail=True,
         methods=["GET"],
         permission_classes=[permissions.IsAuthenticated],
-        pagination_class=LimitOffsetPagination,
+        pagination_class=DefaultPagination,
     )
     def issues(self, request, pk=None):
         project = self.get_object()
-        queryset = project.issue_set.all()
-        if (
-            request.user == project.author
-            or request.user in project.contributors.all()
+        if is_author_or_member(
+            request, project.author_id, project.pk
         ):
-            page = self.paginate_queryset(queryset)
-            if page is not None:
-                serializer = self.get_serializer(page, many=True)
-                return self.get_paginated_response(serializer.data)
-
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            params = request.query_params
+            queryset = filter_issues(project.issue_set.all(), params)
+            self.keyset_ordering = issue_ordering(params)
+            return self.conditional_list(queryset, IssueSerializer)
         return Response(
             "Vous n'avez pas la permission de faire ceci",
             status=status.HTTP_403_FORBIDDEN,
         )
 
+    @action(
+        detail=True,
+        methods=["GET"],
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def changes(self, request, pk=None):
+        project = self.get_object()
+        if not is_author_or_member(request, project.author_id, project.pk):
+            return Response(
+                "Vous n'avez pas la permission de faire ceci",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        position = changes.decode_cursor(request.query_params.get("cursor"))
+        if changes.is_expired(position):
+            return Response(
+                "Curseur expiré, une synchronisation complète est nécessaire",
+                status=status.HTTP_410_GONE,
+            )
+        result = changes.get_changes(
+            project, position, self.paginator.get_page_size(request)
+        )
+        context = self.get_serializer_context()
+        return Response(
+            {
+                "issues": IssueSerializer(
+                    result["issues"], many=True, context=context
+                ).data,
+                "comments": CommentSerializer(
+                    result["comments"], many=True, context=context
+                ).data,
+                "deleted": [
+                    changes.represent_tombstone(tombstone)
+                    for tombstone in result["deleted"]
+                ],
+                "cursor": result["cursor"],
+                "more": result["more"],
+            }
+        )
+
+    @action(
+        detail=True,
+        methods=["GET"],
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def export(self, request, pk=None):
+        project = self.get_object()
+        if not can_view(request, project.author_id, project.pk):
+            return Response(
+                "Vous n'avez pas la permission de faire ceci",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        # not "format", which DRF reserves for renderer negotiation
+        export_format = request.query_params.get("type", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"type": f"Formats disponibles : {", ".join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        generate, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            generate(project), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="project-{project.pk}.{export_format}"'
+        )
+        return response
+
 
-class IssueViewSet(ModelViewSet):
+class IssueViewSet(ConditionalListMixin, CachedRetrieveMixin, ModelViewSet):
     queryset = Issue.objects.all()
     serializer_class = IssueSerializer
     permission_classes = [IssuePermission]
 
+    def get_access_ids(self, instance):
+        return instance.author_id, instance.project_id
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
-        return super().perform_create(serializer)
+
+    @action(
+        detail=False,
+        methods=["POST"],
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def bulk(self, request):
+        serializer = IssueBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        project = serializer.validated_data.pop("project")
+        if not is_author_or_member(request, project.author_id, project.pk):
+            return Response(
+                "Vous n'avez pas la permission de faire ceci",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        batch = IssueBatch(request, project, **serializer.validated_data)
+        if not batch.validate():
+            return Response(batch.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(batch.save(), status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["GET"],
+        permission_classes=[permissions.IsAuthenticated],
+        pagination_class=DefaultPagination,
+    )
+    def mine(self, request):
+        params = request.query_params
+        queryset = filter_issues(
+            user_issues(request.user, params.get("role")), params
+        )
+        self.keyset_ordering = issue_ordering(params, default="-updated_at")
+        return self.conditional_list(queryset)
+
+    @action(
+        detail=False,
+        methods=["GET"],
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def search(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"q": "Ce paramètre est obligatoire"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        issues = Issue.objects.all()
+        comments = Comment.objects.all()
+        if not request.user.is_superuser:
+            issues = issues.filter(project_scope(request.user, "project__"))
+            comments = comments.filter(
+                project_scope(request.user, "issue__project__")
+            )
+        project = request.query_params.get("project")
+        if project is not None:
+            if not project.isdigit():
+                return Response(
+                    {"project": "Identifiant de projet invalide"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            issues = issues.filter(project_id=project)
+            comments = comments.filter(issue__project_id=project)
+
+        backend = get_backend()
+        context = self.get_serializer_context()
+        return Response(
+            {
+                "issues": IssueSerializer(
+                    backend.search_issues(issues, query)[:SEARCH_LIMIT],
+                    many=True,
+                    context=context,
+                ).data,
+                "comments": CommentSerializer(
+                    backend.search_comments(comments, query)[:SEARCH_LIMIT],
+                    many=True,
+                    context=context,
+                ).data,
+            }
+        )
 
     @action(
         detail=True,
         methods=["GET"],
         permission_classes=[permissions.IsAuthenticated],
-        pagination_class=LimitOffsetPagination,
+        pagination_class=DefaultPagination,
     )
     def comments(self, request, pk=None):
         issue = self.get_object()
         queryset = issue.comments.all()
-        if (
-            request.user == issue.author
-            or request.user in issue.project.contributors.all()
+        if is_author_or_member(
+            request, issue.author_id, issue.project_id
         ):
-            page = self.paginate_queryset(queryset)
-            if page is not None:
-                serializer = CommentSerializer(page, many=True)
-                return self.get_paginated_response(serializer.data)
-
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            return self.conditional_list(queryset, CommentSerializer)
         return Response(
             "Vous n'avez pas la permission de faire ceci",
             status=status.HTTP_403_FORBIDDEN,
         )
 
+    @comments.mapping.post
+    def add_comments(self, request, pk=None):
+        issue = self.get_object()
+        if not is_author_or_member(request, issue.author_id, issue.project_id):
+            return Response(
+                "Vous n'avez pas la permission de faire ceci",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        comments, errors = create_comments(request, issue, request.data)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            CommentSerializer(
+                comments, many=True, context=self.get_serializer_context()
+            ).data,
+            status=status.HTTP_201_CREATED,
+        )
+
 
-class CommentViewSet(ModelViewSet):
-    queryset = Comment.objects.all()
+class CommentViewSet(ConditionalListMixin, CachedRetrieveMixin, ModelViewSet):
+    queryset = Comment.objects.select_related("issue")
     serializer_class = CommentSerializer
     permission_classes = [CommentPermission]
 
+    def get_access_ids(self, instance):
+        return instance.author_id, instance.issue.project_id
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
-        return super().perform_create(serializer)
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class SoftdeskConfig(AppConfig):
+    name = "softdesk"
+
+    def ready(self):
+        from softdesk import sqlite  # noqa: F401
@@ -0,0 +1,131 @@
+import base64
+import json
+from types import SimpleNamespace
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination seeking on the ordering columns, so fetching a page
+    costs the same whatever its depth: no OFFSET scan and no COUNT(*).
+    The last ordering field must be unique to break ties.
+    """
+
+    ordering = ("created_at", "id")
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Curseur invalide"
+
+    def get_ordering(self, view):
+        return getattr(view, "keyset_ordering", None) or self.ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(view)
+        self.model = queryset.model
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(position))
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[: self.page_size]
+        self.last = results[-1] if results else None
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.last)
+        )
+
+    def get_field(self, name):
+        return self.model._meta.get_field(name.lstrip("-"))
+
+    def seek_filter(self, position):
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+        seek = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, position):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            seek |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return seek
+
+    def encode_cursor(self, instance):
+        if isinstance(instance, dict):
+            # a `.values()` row, keyed by column name
+            instance = SimpleNamespace(**instance)
+        position = [
+            self.get_field(name).value_to_string(instance)
+            for name in self.ordering
+        ]
+        return base64.urlsafe_b64encode(
+            json.dumps(position).encode()
+        ).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if len(position) != len(self.ordering):
+                raise ValueError
+            return [
+                self.get_field(name).to_python(value)
+                for name, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class DefaultPagination(KeysetPagination):
+    """
+    Keyset pagination by default, limit/offset pagination (with a total
+    count) for clients sending the legacy `limit` or `offset` parameters.
+    """
+
+    def use_limit_offset(self, request):
+        return (
+            LimitOffsetPagination.limit_query_param in request.query_params
+            or LimitOffsetPagination.offset_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit_offset = None
+        if self.use_limit_offset(request):
+            self.limit_offset = LimitOffsetPagination()
+            if not queryset.ordered:
+                queryset = queryset.order_by(*self.get_ordering(view))
+            return self.limit_offset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.limit_offset is not None:
+            return self.limit_offset.get_paginated_response(data)
+        return super().get_paginated_response(data)
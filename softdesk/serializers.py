@@ -0,0 +1,137 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import RelatedField
+
+FIELDS_QUERY_PARAM = "fields"
+OMIT_QUERY_PARAM = "omit"
+
+
+def get_field_names(request, param):
+    # comma separated names, None when the parameter is absent or empty
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    names = {
+        name.strip()
+        for name in request.query_params.get(param, "").split(",")
+        if name.strip()
+    }
+    return names or None
+
+
+def is_sparse(request):
+    return (
+        get_field_names(request, FIELDS_QUERY_PARAM) is not None
+        or get_field_names(request, OMIT_QUERY_PARAM) is not None
+    )
+
+
+def is_selected(name, request):
+    fields = get_field_names(request, FIELDS_QUERY_PARAM)
+    omit = get_field_names(request, OMIT_QUERY_PARAM) or set()
+    return (fields is None or name in fields) and name not in omit
+
+
+class SparseFieldsetMixin:
+    """
+    On read requests, render only the fields listed in `?fields=`, or all
+    but the ones listed in `?omit=`. Unknown names are ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        for name in list(self.fields):
+            if not is_selected(name, request):
+                self.fields.pop(name)
+
+
+def narrow_queryset(queryset, serializer, keep=()):
+    """
+    Restrict `queryset` with `.only()` to the columns `serializer` renders,
+    plus the primary key and `keep` (ordering fields read by pagination).
+    Left untouched when no sparse fieldset was requested, or when a field
+    reads anything other than a model field.
+    """
+    if not is_sparse(serializer.context.get("request")):
+        return queryset
+    opts = queryset.model._meta
+    columns = {opts.pk.name, *keep}
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            return queryset
+        name = field.source.split(".")[0]
+        try:
+            model_field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return queryset
+        if model_field.concrete:
+            columns.add(model_field.name)
+        elif not model_field.many_to_many:
+            return queryset
+    return queryset.only(*columns)
+
+
+def ordering_columns(view):
+    # columns the paginator reads from each row to build its cursor
+    paginator = getattr(view, "paginator", None)
+    if not hasattr(paginator, "get_ordering"):
+        return ()
+    return [name.lstrip("-") for name in paginator.get_ordering(view)]
+
+
+class ValuesRepresentationMixin:
+    """
+    Read-only representations built straight from `.values()` rows,
+    skipping model instances and per-object serializer machinery. Fields
+    are compiled once per class into (name, column, converter) using the
+    fields' own `to_representation`, so the output is identical to the
+    regular one.
+    """
+
+    @classmethod
+    def compile_values_plan(cls):
+        # None when some field does not map to a single model column
+        base = serializers.ModelSerializer.to_representation
+        if cls.to_representation is not base:
+            return None
+        opts = cls.Meta.model._meta
+        plan = []
+        for field in cls()._readable_fields:
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete:
+                return None
+            # related fields render the primary key the column holds
+            if isinstance(field, RelatedField):
+                convert = None
+            else:
+                convert = field.to_representation
+            plan.append((field.field_name, model_field.attname, convert))
+        return tuple(plan)
+
+    @classmethod
+    def get_values_plan(cls, request=None):
+        if "_values_plan" not in cls.__dict__:
+            cls._values_plan = cls.compile_values_plan()
+        if cls._values_plan is None:
+            return None
+        return [
+            entry
+            for entry in cls._values_plan
+            if is_selected(entry[0], request)
+        ]
+
+
+def represent_row(plan, row):
+    data = {}
+    for name, column, convert in plan:
+        value = row[column]
+        if value is not None and convert is not None:
+            value = convert(value)
+        data[name] = value
+    return data
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
     "users",
     "rest_framework_simplejwt",
     "projects",
+    "softdesk",
 ]
 
 MIDDLEWARE = [
@@ -79,13 +81,51 @@ WSGI_APPLICATION = "softdesk.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Connections are kept open between requests, and every new one gets the
+# read-heavy profile below (see softdesk.sqlite): readers no longer block
+# behind writers with WAL journaling. "timeout" is how long a writer waits
+# for the lock, in seconds. python -m benchmarks.sqlite_load compares the
+# profile against the defaults under concurrent reads and writes.
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"timeout": 20},
     }
 }
 
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    # durable at checkpoints rather than at every commit in WAL mode
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 2**20,
+    # in KiB when negative
+    "cache_size": -20000,
+    "temp_store": "MEMORY",
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# "responses" holds rendered project/issue/comment details (see
+# projects.caching): point it at a shared backend such as Redis or
+# Memcached when running several processes.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "responses": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "softdesk-responses",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -105,6 +145,36 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+# New passwords use the first hasher, the others still verify existing
+# hashes; a hash made with another hasher or cost is replaced on the next
+# login. Costs left unset follow Django's defaults (see
+# users.hashers.DEFAULT_COSTS); a deployment overrides one with an
+# environment variable, e.g. SOFTDESK_PBKDF2_ITERATIONS=600000
+# (python -m benchmarks.hashers reports the logins per second and per core
+# they allow).
+
+PASSWORD_HASHERS = [
+    "users.hashers.PBKDF2PasswordHasher",
+    "users.hashers.ScryptPasswordHasher",
+    "users.hashers.Argon2PasswordHasher",
+]
+
+PASSWORD_HASHING = {
+    name: int(os.environ[f"SOFTDESK_{name.upper()}"])
+    for name in [
+        "pbkdf2_iterations",
+        "scrypt_work_factor",
+        "argon2_time_cost",
+        "argon2_memory_cost",
+        "argon2_parallelism",
+        # simultaneous hashes per process, one per core when unset
+        "concurrency",
+    ]
+    if os.environ.get(f"SOFTDESK_{name.upper()}")
+}
+
 AUTH_USER_MODEL = "users.User"
 
 # Internationalization
@@ -131,8 +201,21 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.ClaimsJWTAuthentication",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "softdesk.pagination.DefaultPagination",
+    "DEFAULT_RENDERER_CLASSES": (
+        "softdesk.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "softdesk.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 5,
 }
+
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializer.TokenObtainPairSerializer",
+}
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_pragmas(sender, connection, **kwargs):
+    # settings.SQLITE_PRAGMAS on every new SQLite connection; run on the raw
+    # connection so they never show up in the queries log
+    if connection.vendor != "sqlite":
+        return
+    for name, value in getattr(settings, "SQLITE_PRAGMAS", {}).items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
@@ -22,7 +22,7 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
-from users.views import UserViewSet
+from users.views import UserViewSet, DeletionJobViewSet
 from projects.views import ProjectViewSet, IssueViewSet, CommentViewSet
 
 router = routers.DefaultRouter()
@@ -30,6 +30,7 @@ router.register(r"users", UserViewSet, basename="user")
 router.register(r"projects", ProjectViewSet, basename="project")
 router.register(r"issues", IssueViewSet, basename="issue")
 router.register(r"comments", CommentViewSet, basename="comment")
+router.register(r"deletions", DeletionJobViewSet, basename="deletion")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -0,0 +1,111 @@
+import threading
+import time
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from users.models import User
+
+# Seconds a user's state is trusted before being read again: deactivating,
+# deleting or promoting a user reaches other processes within that delay
+USER_STATE_TTL = 30
+# Users whose state is kept per process, the oldest entries go first
+MAX_USER_STATES = 10000
+# Claims added to access tokens (see users.serializer.TokenObtainPairSerializer)
+USER_CLAIMS = ("username", "is_superuser")
+USER_STATE_FIELDS = ("id",) + USER_CLAIMS + ("is_active",)
+
+# user pk -> (expiry, state); state is None for missing users, otherwise
+# the values of USER_STATE_FIELDS[1:] followed by the password's digest
+_user_states = {}
+_user_states_lock = threading.Lock()
+
+
+def get_user_state(user_id):
+    now = time.monotonic()
+    cached = _user_states.get(user_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    row = (
+        User.objects.filter(pk=user_id)
+        .values_list(*USER_STATE_FIELDS[1:], "password")
+        .first()
+    )
+    # only a digest of the password hash is kept, see CHECK_REVOKE_TOKEN
+    state = None
+    if row is not None:
+        state = (*row[:-1], get_md5_hash_password(row[-1]))
+    with _user_states_lock:
+        if len(_user_states) >= MAX_USER_STATES:
+            expired = [
+                key for key, entry in _user_states.items() if entry[0] <= now
+            ]
+            for key in expired:
+                del _user_states[key]
+        while len(_user_states) >= MAX_USER_STATES:
+            del _user_states[next(iter(_user_states))]
+        _user_states[user_id] = (now + USER_STATE_TTL, state)
+    return state
+
+
+def forget_user_state(user_id):
+    with _user_states_lock:
+        _user_states.pop(user_id, None)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Builds request.user from the token claims instead of loading the user
+    row on every request. The user's state is read at most once every
+    USER_STATE_TTL seconds to reject tokens of deleted, deactivated or
+    changed users. request.user is a User whose other fields are deferred:
+    reading one of them loads it from the database.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_FIELD != User._meta.pk.attname:
+            return super().get_user(validated_token)
+        try:
+            # depending on the simplejwt version, the claim is a string
+            user_id = User._meta.pk.to_python(
+                validated_token[api_settings.USER_ID_CLAIM]
+            )
+            claims = tuple(validated_token[claim] for claim in USER_CLAIMS)
+        except KeyError:
+            # tokens issued before the claims were added
+            return super().get_user(validated_token)
+        except ValidationError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        *current, is_active, password_digest = state
+        # stock get_user settings; CHECK_USER_IS_ACTIVE is simplejwt 5.4+
+        if getattr(api_settings, "CHECK_USER_IS_ACTIVE", True) and not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if tuple(current) != claims:
+            raise AuthenticationFailed(
+                _("Token is invalid or expired"), code="token_not_valid"
+            )
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_digest
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        values = dict(zip(USER_STATE_FIELDS, (user_id, *claims, is_active)))
+        # from_db takes the values in the model's field order
+        names = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            DEFAULT_DB_ALIAS, names, [values[name] for name in names]
+        )
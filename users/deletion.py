@@ -0,0 +1,99 @@
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from users.models import (
+    DeletionJob,
+    User,
+    get_sentinel_user,
+    reassign_to_sentinel,
+    sentinel_relations,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows reassigned per transaction: SQLite's write lock is released between
+# batches so other requests keep writing during a large erasure
+BATCH_SIZE = 500
+
+
+@functools.cache
+def get_executor():
+    # a single worker: jobs never compete with each other for the lock
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="user-deletion")
+
+
+def request_deletion(user):
+    """
+    Deactivate `user` and queue the erasure of their account, returning the
+    job. Queued jobs run in this process once the transaction commits; the
+    run_deletion_jobs command resumes the ones a restart interrupted.
+    """
+    with transaction.atomic():
+        job = DeletionJob.objects.filter(
+            user_id=user.pk, status__in=[DeletionJob.PENDING, DeletionJob.RUNNING]
+        ).first()
+        if job is not None:
+            return job
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        job = DeletionJob.objects.create(user_id=user.pk)
+        transaction.on_commit(lambda: get_executor().submit(run_job, job.pk))
+    return job
+
+
+def run_job(job_id):
+    try:
+        process_job(job_id)
+    except Exception:
+        logger.exception("User deletion job %s failed", job_id)
+    finally:
+        # the worker thread's own connection
+        connection.close()
+
+
+def process_job(job_id):
+    job = DeletionJob.objects.get(pk=job_id)
+    if job.status == DeletionJob.DONE:
+        return
+    DeletionJob.objects.filter(pk=job.pk).update(status=DeletionJob.RUNNING)
+    try:
+        erase_user(job.user_id)
+    except Exception:
+        DeletionJob.objects.filter(pk=job.pk).update(
+            status=DeletionJob.FAILED, finished_at=timezone.now()
+        )
+        raise
+    DeletionJob.objects.filter(pk=job.pk).update(
+        status=DeletionJob.DONE, finished_at=timezone.now()
+    )
+
+
+def erase_user(user_id):
+    sentinel = get_sentinel_user()
+    for relation in sentinel_relations():
+        rows = relation.related_model._base_manager.filter(
+            **{relation.field.name: user_id}
+        )
+        while True:
+            with transaction.atomic():
+                batch = list(rows.values_list("pk", flat=True)[:BATCH_SIZE])
+                if batch:
+                    reassign_to_sentinel(
+                        relation, Q(pk__in=batch), sentinel, timezone.now()
+                    )
+            if len(batch) < BATCH_SIZE:
+                break
+    # nothing is left to reassign: only memberships go with the account
+    user = User.objects.filter(pk=user_id).first()
+    if user is not None:
+        user.delete()
+
+
+def pending_jobs():
+    # RUNNING jobs found at startup were interrupted, resuming them is safe
+    return DeletionJob.objects.filter(
+        status__in=[DeletionJob.PENDING, DeletionJob.RUNNING]
+    ).order_by("requested_at")
@@ -0,0 +1,87 @@
+import functools
+import os
+import threading
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+# Costs used when settings.PASSWORD_HASHING does not override them
+DEFAULT_COSTS = {
+    "pbkdf2_iterations": hashers.PBKDF2PasswordHasher.iterations,
+    "scrypt_work_factor": hashers.ScryptPasswordHasher.work_factor,
+    "argon2_time_cost": hashers.Argon2PasswordHasher.time_cost,
+    "argon2_memory_cost": hashers.Argon2PasswordHasher.memory_cost,
+    "argon2_parallelism": hashers.Argon2PasswordHasher.parallelism,
+    # simultaneous hashes per process, None for one per core
+    "concurrency": None,
+}
+
+
+def get_cost(name):
+    return getattr(settings, "PASSWORD_HASHING", {}).get(
+        name, DEFAULT_COSTS[name]
+    )
+
+
+@functools.cache
+def get_hashing_slots():
+    return threading.BoundedSemaphore(
+        get_cost("concurrency") or os.cpu_count() or 1
+    )
+
+
+@receiver(setting_changed)
+def reset_hashing_slots(*, setting, **kwargs):
+    if setting == "PASSWORD_HASHING":
+        get_hashing_slots.cache_clear()
+
+
+class LimitedHasherMixin:
+    """
+    Hashes while holding one of the process' hashing slots, so a burst of
+    signups or logins queues up instead of oversubscribing the cores that
+    other requests need.
+    """
+
+    def encode(self, *args, **kwargs):
+        with get_hashing_slots():
+            return super().encode(*args, **kwargs)
+
+
+# The hashers below keep Django's algorithm names: stored hashes stay
+# valid, and check_password rehashes them on the next login when the
+# configured cost differs (see must_update).
+
+
+class PBKDF2PasswordHasher(LimitedHasherMixin, hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return get_cost("pbkdf2_iterations")
+
+
+class ScryptPasswordHasher(LimitedHasherMixin, hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return get_cost("scrypt_work_factor")
+
+
+class Argon2PasswordHasher(LimitedHasherMixin, hashers.Argon2PasswordHasher):
+    # requires argon2-cffi (pip install django[argon2])
+
+    @property
+    def time_cost(self):
+        return get_cost("argon2_time_cost")
+
+    @property
+    def memory_cost(self):
+        return get_cost("argon2_memory_cost")
+
+    @property
+    def parallelism(self):
+        return get_cost("argon2_parallelism")
+
+    def verify(self, password, encoded):
+        # unlike the other hashers, does not go through encode
+        with get_hashing_slots():
+            return super().verify(password, encoded)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from users.deletion import pending_jobs, process_job
+
+
+class Command(BaseCommand):
+    help = "Run queued user deletion jobs, such as those interrupted by a restart"
+
+    def handle(self, *args, **options):
+        done = 0
+        for job in pending_jobs():
+            process_job(job.pk)
+            done += 1
+        self.stdout.write(self.style.SUCCESS(f"Ran {done} deletion job(s)"))
@@ -1,11 +1,52 @@
-from django.db import models
+import uuid
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
+
+# the sentinel user, once the transaction that found or created it has
+# committed (see get_sentinel_user)
+_sentinel = {}
 
 
 def get_sentinel_user():
-    return User.objects.get_or_create(
+    """
+    The user rows of deleted users are reassigned to, resolved once per
+    process.
+    """
+    if "user" in _sentinel:
+        return _sentinel["user"]
+    user = User.objects.get_or_create(
         username="deleted", birth_date="2024-01-01"
     )[0]
+    # a rolled back creation must not be remembered
+    transaction.on_commit(lambda: _sentinel.setdefault("user", user))
+    return user
+
+
+def forget_sentinel_user(pk):
+    if "user" in _sentinel and _sentinel["user"].pk == pk:
+        del _sentinel["user"]
+
+
+def sentinel_relations():
+    # reverse relations of the foreign keys declared with
+    # on_delete=models.SET(get_sentinel_user)
+    return [
+        relation
+        for relation in User._meta.related_objects
+        if getattr(relation.on_delete, "deconstruct", lambda: None)()
+        == ("django.db.models.SET", (get_sentinel_user,), {})
+    ]
+
+
+def reassign_to_sentinel(relation, rows, sentinel, now):
+    # `rows` of relation.related_model, touching updated_at so the changes
+    # feed reports them
+    model = relation.related_model
+    changes = {relation.field.name: sentinel}
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        changes["updated_at"] = now
+    return model._base_manager.filter(rows).update(**changes)
 
 
 class User(AbstractUser):
@@ -15,3 +56,50 @@ class User(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
 
     REQUIRED_FIELDS = ["birth_date"]
+
+    def delete(self, *args, **kwargs):
+        # one UPDATE per relation instead of loading the rows (see
+        # users.deletion for accounts too large for a single transaction)
+        with transaction.atomic():
+            sentinel = get_sentinel_user()
+            now = timezone.now()
+            for relation in sentinel_relations():
+                reassign_to_sentinel(
+                    relation,
+                    models.Q(**{relation.field.name: self}),
+                    sentinel,
+                    now,
+                )
+            return super().delete(*args, **kwargs)
+
+
+class DeletionJob(models.Model):
+    """
+    Queued erasure of a user account, see users.deletion. The user is
+    deactivated when the job is queued and deleted once it is done.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # not a foreign key: the job outlives the user
+    user_id = models.BigIntegerField()
+    status = models.CharField(choices=STATUS, default=PENDING, max_length=7)
+    requested_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "requested_at"],
+                name="deletion_status_idx",
+            ),
+        ]
@@ -1,10 +1,13 @@
 import datetime
 from django.contrib.auth.hashers import make_password
 from rest_framework import serializers
-from users.models import User
+from rest_framework_simplejwt import serializers as jwt_serializers
+from users.models import DeletionJob, User
+from softdesk.serializers import SparseFieldsetMixin
+from users.authentication import USER_CLAIMS
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
     can_be_contacted = serializers.BooleanField(default=False)
     can_data_be_shared = serializers.BooleanField(default=False)
@@ -71,3 +74,20 @@ class UserSerializer(serializers.ModelSerializer):
             else validated_data.get("can_data_be_shared")
         )
         return super().update(instance, validated_data)
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DeletionJob
+        fields = ["id", "status", "requested_at", "finished_at"]
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    # claims read by users.authentication.ClaimsJWTAuthentication, copied
+    # to the access tokens issued on refresh
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from users.authentication import forget_user_state
+from users.models import User, forget_sentinel_user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_state(sender, instance, **kwargs):
+    # other processes notice within USER_STATE_TTL
+    forget_user_state(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_sentinel(sender, instance, **kwargs):
+    forget_sentinel_user(instance.pk)
@@ -1,8 +1,28 @@
+import io
 import json
+import uuid
+from unittest import mock
+from django.contrib.auth import hashers
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from users.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from users import authentication
+from users.authentication import ClaimsJWTAuthentication
+from projects.models import Project, Issue, Comment
+from users.deletion import request_deletion
+from users.models import (
+    DeletionJob,
+    User,
+    forget_sentinel_user,
+    get_sentinel_user,
+)
 
 
 class UsersTest(APITestCase):
@@ -184,7 +204,9 @@ class UsersTest(APITestCase):
             reverse("user-detail", kwargs={"pk": 1}),
             headers={"Authorization": bearer}
         )
-        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(User.objects.get().is_active)
+        call_command("run_deletion_jobs", stdout=io.StringIO())
         self.assertEqual(User.objects.count(), 1)
         self.assertEqual(User.objects.get().username, "deleted")
 
@@ -221,3 +243,268 @@ class UsersTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertEqual(User.objects.count(), 2)
         self.assertEqual(User.objects.get(pk=2).username, "Joe")
+
+    def test_list_users_sparse_fieldset(self):
+        url = reverse("user-list")
+        for username in ["Billy", "Joe"]:
+            self.client.post(url, {"username": username, "password": "password123", "birth_date": "2000-01-01"}, format="json")
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "Billy", "password": "password123"},
+            format="json",
+        )
+        bearer = f"Bearer {json.loads(response.content)["access"]}"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"fields": "id,username"}, headers={"Authorization": bearer})
+        self.assertEqual(
+            json.loads(response.content)["results"],
+            [{"id": 1, "username": "Billy"}, {"id": 2, "username": "Joe"}],
+        )
+        self.assertNotIn('"birth_date"', queries.captured_queries[-1]["sql"])
+
+
+class ClaimsAuthenticationTest(APITestCase):
+    def setUp(self):
+        self.client.post(
+            reverse("user-list"),
+            {"username": "Billy", "password": "password123", "birth_date": "2000-01-01"},
+            format="json",
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "Billy", "password": "password123"},
+            format="json",
+        )
+        self.access = json.loads(response.content)["access"]
+        self.bearer = f"Bearer {self.access}"
+        self.url = reverse("user-detail", kwargs={"pk": 1})
+
+    def test_token_carries_user_claims(self):
+        token = AccessToken(self.access)
+        self.assertEqual(token["username"], "Billy")
+        self.assertEqual(token["is_superuser"], False)
+
+    def test_user_state_is_cached_between_requests(self):
+        self.client.get(self.url, headers={"Authorization": self.bearer})
+        # the requested user only
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, headers={"Authorization": self.bearer})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_request_user_loads_other_fields_lazily(self):
+        user = ClaimsJWTAuthentication().get_user(AccessToken(self.access))
+        self.assertEqual((user.pk, user.username, user.is_superuser), (1, "Billy", False))
+        self.assertIn("birth_date", user.get_deferred_fields())
+        with self.assertNumQueries(1):
+            self.assertEqual(str(user.birth_date), "2000-01-01")
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(self.url, headers={"Authorization": self.bearer})
+        user = User.objects.get()
+        user.is_active = False
+        user.save()
+        response = self.client.get(self.url, headers={"Authorization": self.bearer})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        self.client.delete(self.url, headers={"Authorization": self.bearer})
+        response = self.client.get(self.url, headers={"Authorization": self.bearer})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_outdated_claims_are_rejected(self):
+        self.client.get(self.url, headers={"Authorization": self.bearer})
+        user = User.objects.get()
+        user.is_superuser = True
+        user.save()
+        response = self.client.get(self.url, headers={"Authorization": self.bearer})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_string_user_id_claim_is_converted(self):
+        # simplejwt >= 5.4 issues the user id claim as a string
+        token = AccessToken(self.access)
+        token["user_id"] = "1"
+        user = ClaimsJWTAuthentication().get_user(token)
+        self.assertEqual(user.pk, 1)
+        self.assertIn(1, authentication._user_states)
+        User.objects.get().save()
+        self.assertNotIn(1, authentication._user_states)
+
+    def test_invalid_user_id_claim_is_rejected(self):
+        token = AccessToken(self.access)
+        token["user_id"] = "abc"
+        with self.assertRaises(InvalidToken):
+            ClaimsJWTAuthentication().get_user(token)
+
+    def test_changed_password_revokes_tokens(self):
+        with mock.patch.object(api_settings, "CHECK_REVOKE_TOKEN", True):
+            response = self.client.post(
+                reverse("token_obtain_pair"),
+                {"username": "Billy", "password": "password123"},
+                format="json",
+            )
+            bearer = f"Bearer {json.loads(response.content)["access"]}"
+            response = self.client.get(self.url, headers={"Authorization": bearer})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            user = User.objects.get()
+            user.set_password("password456")
+            user.save()
+            response = self.client.get(self.url, headers={"Authorization": bearer})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @mock.patch("users.authentication.MAX_USER_STATES", 2)
+    def test_user_states_are_bounded(self):
+        for user_id in [100, 101, 102]:
+            authentication.get_user_state(user_id)
+        self.assertEqual(list(authentication._user_states)[-2:], [101, 102])
+        self.assertLessEqual(len(authentication._user_states), 2)
+
+    def test_tokens_without_claims_load_the_user(self):
+        bearer = f"Bearer {AccessToken.for_user(User.objects.get())}"
+        response = self.client.get(self.url, headers={"Authorization": bearer})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(
+    PASSWORD_HASHERS=[
+        "users.hashers.PBKDF2PasswordHasher",
+        "users.hashers.ScryptPasswordHasher",
+    ],
+    PASSWORD_HASHING={"pbkdf2_iterations": 1000, "scrypt_work_factor": 2**10},
+)
+class PasswordHashingTest(APITestCase):
+    def setUp(self):
+        self.client.post(
+            reverse("user-list"),
+            {"username": "Billy", "password": "password123", "birth_date": "2000-01-01"},
+            format="json",
+        )
+
+    def login(self):
+        return self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "Billy", "password": "password123"},
+            format="json",
+        )
+
+    def test_registration_uses_configured_cost(self):
+        self.assertTrue(User.objects.get().password.startswith("pbkdf2_sha256$1000$"))
+
+    @override_settings(PASSWORD_HASHING={"pbkdf2_iterations": 2000})
+    def test_login_rehashes_with_new_cost(self):
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(User.objects.get().password.startswith("pbkdf2_sha256$2000$"))
+
+    @override_settings(PASSWORD_HASHING={})
+    def test_unset_cost_follows_django_default(self):
+        iterations = hashers.PBKDF2PasswordHasher.iterations
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            User.objects.get().password.startswith(f"pbkdf2_sha256${iterations}$")
+        )
+
+    def test_login_rehashes_with_new_hasher(self):
+        with self.settings(
+            PASSWORD_HASHERS=[
+                "users.hashers.ScryptPasswordHasher",
+                "users.hashers.PBKDF2PasswordHasher",
+            ]
+        ):
+            response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(User.objects.get().password.startswith("scrypt$"))
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+
+class UserDeletionTest(APITestCase):
+    def setUp(self):
+        self.client.post(
+            reverse("user-list"),
+            {"username": "Billy", "password": "password123", "birth_date": "2000-01-01"},
+            format="json",
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "Billy", "password": "password123"},
+            format="json",
+        )
+        self.bearer = f"Bearer {json.loads(response.content)["access"]}"
+        self.client.post(reverse("project-list"), {}, headers={"Authorization": self.bearer})
+        self.client.post(
+            reverse("issue-list"),
+            {"project": 1, "title": "Issue", "assigned_to": 1},
+            format="json",
+            headers={"Authorization": self.bearer},
+        )
+        self.client.post(
+            reverse("comment-list"),
+            {"issue": 1, "description": "Lorem ipsum"},
+            headers={"Authorization": self.bearer},
+        )
+
+    def delete_user(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.delete(
+                reverse("user-detail", kwargs={"pk": 1}),
+                headers={"Authorization": self.bearer},
+            )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        # handed over to the worker thread once committed
+        self.assertEqual(len(callbacks), 1)
+        return response
+
+    def test_deletion_is_queued_with_a_status_resource(self):
+        response = self.delete_user()
+        job = json.loads(response.content)
+        self.assertEqual(job["status"], "pending")
+        self.assertEqual(
+            response.headers["Location"],
+            f"http://testserver{reverse("deletion-detail", kwargs={"pk": job["id"]})}",
+        )
+        self.assertFalse(User.objects.get(pk=1).is_active)
+        response = self.client.get(response.headers["Location"])
+        self.assertEqual(json.loads(response.content)["status"], "pending")
+        call_command("run_deletion_jobs", stdout=io.StringIO())
+        response = self.client.get(reverse("deletion-detail", kwargs={"pk": job["id"]}))
+        content = json.loads(response.content)
+        self.assertEqual(content["status"], "done")
+        self.assertIsNotNone(content["finished_at"])
+        self.assertFalse(User.objects.filter(pk=1).exists())
+
+    def test_deletion_is_requested_once(self):
+        first = json.loads(self.delete_user().content)
+        self.assertEqual(request_deletion(User.objects.get(pk=1)).pk, uuid.UUID(first["id"]))
+        self.assertEqual(DeletionJob.objects.count(), 1)
+
+    @mock.patch("users.deletion.BATCH_SIZE", 1)
+    def test_rows_are_reassigned_to_the_sentinel(self):
+        self.client.post(
+            reverse("issue-list"),
+            {"project": 1, "title": "Issue", "assigned_to": 1},
+            format="json",
+            headers={"Authorization": self.bearer},
+        )
+        updated_at = Issue.objects.get(pk=1).updated_at
+        self.delete_user()
+        call_command("run_deletion_jobs", stdout=io.StringIO())
+        sentinel = User.objects.get()
+        self.assertEqual(sentinel.username, "deleted")
+        self.assertEqual(Project.objects.get().author, sentinel)
+        for issue in Issue.objects.all():
+            self.assertEqual((issue.author, issue.assigned_to), (sentinel, sentinel))
+        self.assertGreater(Issue.objects.get(pk=1).updated_at, updated_at)
+        self.assertEqual(Comment.objects.get().author, sentinel)
+
+    def test_sentinel_is_resolved_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            sentinel = get_sentinel_user()
+        self.addCleanup(forget_sentinel_user, sentinel.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_sentinel_user(), sentinel)
+
+    def test_rolled_back_sentinel_is_not_remembered(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            get_sentinel_user()
+        with self.assertNumQueries(1):
+            get_sentinel_user()
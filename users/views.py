@@ -1,7 +1,11 @@
-from rest_framework import mixins, viewsets
-from users.models import User
-from users.serializer import UserSerializer
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from users.deletion import request_deletion
+from users.models import DeletionJob, User
+from users.serializer import DeletionJobSerializer, UserSerializer
 from users.permissions import UserPermission
+from softdesk.serializers import narrow_queryset, ordering_columns
 
 
 class UserViewSet(
@@ -19,3 +23,35 @@ class UserViewSet(
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [UserPermission]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            queryset = narrow_queryset(
+                queryset, self.get_serializer(), keep=ordering_columns(self)
+            )
+        return queryset
+
+    def destroy(self, request, *args, **kwargs):
+        # the account is deactivated now and erased in the background
+        job = request_deletion(self.get_object())
+        return Response(
+            DeletionJobSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={
+                "Location": reverse(
+                    "deletion-detail", kwargs={"pk": job.pk}, request=request
+                )
+            },
+        )
+
+
+class DeletionJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Status of a user deletion. The former user cannot authenticate anymore:
+    the unguessable job id is what grants access.
+    """
+
+    queryset = DeletionJob.objects.all()
+    serializer_class = DeletionJobSerializer
+    permission_classes = [permissions.AllowAny]